@@ -1,17 +1,28 @@
 import httpx
-from typing import Dict, Any, List
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
 
 class AgentManager:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, http_client: Optional[httpx.AsyncClient] = None):
         self.base_url = base_url.rstrip("/")
         self.registered_agents = {}  # Maps agent name -> agent_id
+        # Shared app-wide client (app.state.http); without one, each call opens its own
+        self._http = http_client
+
+    @asynccontextmanager
+    async def _client(self):
+        if self._http is not None:
+            yield self._http
+        else:
+            async with httpx.AsyncClient(timeout=30) as client:
+                yield client
 
     async def fetch_existing_agents(self):
         """
         Fetch existing agents from the LlamaStack server and update self.registered_agents.
         """
         url = f"{self.base_url}/v1/agents"
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with self._client() as client:
             resp = await client.get(url)
             resp.raise_for_status()
             data = resp.json()
@@ -24,7 +35,7 @@ class AgentManager:
 
     async def create_agent(self, agent_config: Dict[str, Any]) -> str:
         url = f"{self.base_url}/v1/agents"
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with self._client() as client:
             resp = await client.post(url, json={"agent_config": agent_config})
             resp.raise_for_status()
             agent_id = resp.json().get("agent_id")
@@ -12,6 +12,8 @@ from typing import Tuple, Optional
 
 logger = logging.getLogger("ContentProcessor")
 
+_DOCUMENT_MARKER_RE = re.compile(r"^('?-{3,}'?\n?)+", re.MULTILINE)
+
 class ContentProcessor:
     """Handles preprocessing of Ansible playbook content."""
     
@@ -29,8 +31,8 @@ class ContentProcessor:
             Tuple of (cleaned_content, error_result_or_none)
             If error_result is not None, processing failed.
         """
-        logger.info(f"📥 Processing playbook: {len(raw_playbook)} chars")
-        logger.info(f"📝 Raw input preview: {repr(raw_playbook[:100])}")
+        logger.info("📥 Processing playbook: %d chars", len(raw_playbook))
+        logger.info("📝 Raw input preview: %.100r", raw_playbook)
         
         try:
             # Step 1: Basic cleaning
@@ -51,10 +53,11 @@ class ContentProcessor:
                 if validation_error:
                     return cleaned, validation_error
             
-            logger.info(f"🧹 Content processed successfully: {len(cleaned)} chars")
-            logger.info("🧾 Processed preview (first 10 lines):")
-            for i, line in enumerate(cleaned.split('\n')[:10], 1):
-                logger.info(f"  {i:2d}: {line}")
+            logger.info("🧹 Content processed successfully: %d chars", len(cleaned))
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("🧾 Processed preview (first 10 lines):")
+                for i, line in enumerate(cleaned.split('\n', 10)[:10], 1):
+                    logger.info(f"  {i:2d}: {line}")
                 
             return cleaned, None
             
@@ -101,7 +104,7 @@ class ContentProcessor:
     def _ensure_yaml_document_marker(self, content: str) -> str:
         """Ensure proper YAML document marker."""
         # Remove existing document markers
-        content = re.sub(r"^('?-{3,}'?\n?)+", '', content, flags=re.MULTILINE)
+        content = _DOCUMENT_MARKER_RE.sub('', content)
         
         # Add single document marker
         if not content.startswith('---'):
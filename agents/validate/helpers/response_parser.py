@@ -49,7 +49,7 @@ class ValidationResponseParser:
                 try:
                     for item in response:
                         events_processed += 1
-                        logger.debug(f"🔍 Processing response item {events_processed}: {type(item)}")
+                        logger.debug("🔍 Processing response item %d: %s", events_processed, type(item))
                         
                         # Try to extract from item
                         result = self._extract_from_response_item(item)
@@ -62,7 +62,7 @@ class ValidationResponseParser:
                             agent_text += text
                             
                 except Exception as e:
-                    logger.debug(f"Response iteration failed: {e}")
+                    logger.debug("Response iteration failed: %s", e)
             
             # Method 2: Direct attribute access
             if not tool_results:
@@ -110,7 +110,7 @@ class ValidationResponseParser:
             else:
                 logger.warning("⚠️ No validation result found")
                 if tool_results:
-                    logger.debug(f"🔍 Available tool results: {tool_results}")
+                    logger.debug("🔍 Available tool results: %s", tool_results)
             
             return validation_result, agent_text.strip(), debug_info
             
@@ -165,7 +165,7 @@ class ValidationResponseParser:
                     return item.payload
                     
         except Exception as e:
-            logger.debug(f"Error extracting from response item: {e}")
+            logger.debug("Error extracting from response item: %s", e)
             
         return None
 
@@ -193,7 +193,7 @@ class ValidationResponseParser:
                             return result
                             
         except Exception as e:
-            logger.debug(f"Error extracting from direct attributes: {e}")
+            logger.debug("Error extracting from direct attributes: %s", e)
             
         return None
 
@@ -209,7 +209,7 @@ class ValidationResponseParser:
                     return result
                     
         except Exception as e:
-            logger.debug(f"Error extracting from string representation: {e}")
+            logger.debug("Error extracting from string representation: %s", e)
             
         return None
 
@@ -233,7 +233,7 @@ class ValidationResponseParser:
                         return result
                         
         except Exception as e:
-            logger.debug(f"Error extracting from streaming response: {e}")
+            logger.debug("Error extracting from streaming response: %s", e)
             
         return None
 
@@ -262,7 +262,7 @@ class ValidationResponseParser:
                     return content + "\n"
                     
         except Exception as e:
-            logger.debug(f"Error extracting text from item: {e}")
+            logger.debug("Error extracting text from item: %s", e)
             
         return None
 
@@ -308,7 +308,7 @@ class ValidationResponseParser:
                     continue
                     
         except Exception as e:
-            logger.debug(f"Error extracting JSON from string: {e}")
+            logger.debug("Error extracting JSON from string: %s", e)
             
         return None
 
@@ -333,7 +333,7 @@ class ValidationResponseParser:
     def _find_best_validation_result(self, tool_results: List) -> Optional[Dict]:
         """Find the best validation result from collected tool results."""
         for i, tool_result in enumerate(tool_results):
-            logger.debug(f"🔍 Checking tool result {i}: {type(tool_result)}")
+            logger.debug("🔍 Checking tool result %d: %s", i, type(tool_result))
             
             # Direct dict with validation_passed
             if isinstance(tool_result, dict) and 'validation_passed' in tool_result:
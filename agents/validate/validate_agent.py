@@ -1,54 +1,161 @@
+import asyncio
+import copy
+import hashlib
 import logging
 import uuid
 import json
+import string
 import time
-import re
-from typing import Optional, Dict, Any, List, AsyncGenerator
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, AsyncGenerator, Callable, Tuple
 
 from llama_stack_client import LlamaStackClient
-from llama_stack_client.types import UserMessage
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger("ValidationAgent")
 
+LINT_TOOLGROUP = "mcp::ansible_lint"
+_TURN_COMPLETE = "turn_complete"
+_TOOL_STEP_TYPES = frozenset({"tool_execution", "ToolExecutionStep"})
+_LOG_TAG = "[validate]"
+_TOOL_TAG = "[tool]"
+_SESSION_PATTERN = "Registry-based"
+_PROFILE_DESCRIPTIONS = MappingProxyType({
+    "basic": "Basic syntax and structure validation",
+    "moderate": "Standard best practices checking",
+    "safety": "Security-focused validation rules",
+    "shared": "Rules for shared/reusable playbooks",
+    "production": "Strict production-ready validation"
+})
+
+_TOOL_TEST_PLAYBOOK = """---
+- name: Simple test
+  hosts: localhost
+  tasks:
+    - name: Debug task
+      debug:
+        msg: "test"
+"""
+_TOOL_TEST_PROMPT = f"""Use the lint_ansible_playbook tool to check this playbook:
+
+{_TOOL_TEST_PLAYBOOK}
+
+Call the ansible-lint tool now."""
+
+_DEBUG_ENABLED = logger.isEnabledFor(logging.DEBUG)
+
+
+def refresh_log_level() -> None:
+    """Re-evaluate the cached DEBUG flag; call after changing the ValidationAgent log level."""
+    global _DEBUG_ENABLED
+    _DEBUG_ENABLED = logger.isEnabledFor(logging.DEBUG)
+
+
+def _step_type(step) -> str:
+    """Step type as reported by LlamaStack, falling back to the step's class name."""
+    step_type = getattr(step, "step_type", None)
+    return step_type if step_type is not None else type(step).__name__
+
+
+def _progress_event(payload) -> Optional[Dict[str, Any]]:
+    """Translate a turn stream payload into a client-facing progress event, or None to skip it."""
+    event_type = getattr(payload, "event_type", None)
+    if event_type == "step_progress":
+        delta = getattr(payload, "delta", None)
+        if getattr(delta, "type", None) == "text":
+            return {"type": "token", "delta": getattr(delta, "text", "")}
+        return None
+    step_type = getattr(payload, "step_type", None)
+    if step_type not in _TOOL_STEP_TYPES:
+        return None
+    if event_type == "step_start":
+        return {"type": "tool_call_started", "tool": LINT_TOOLGROUP}
+    if event_type == "step_complete":
+        responses = getattr(getattr(payload, "step_details", None), "tool_responses", None) or ()
+        content = getattr(responses[0], "content", "") if responses else ""
+        return {"type": "tool_result", "tool": LINT_TOOLGROUP, "preview": str(content)[:200]}
+    return None
+
 
 def extract_mcp_tool_result(turn):
     """
     Returns the first MCP tool_execution step output, parsed as JSON.
     Ignores post-tool inference steps.
     """
-    steps = getattr(turn, "steps", [])
-    logger.debug(f"🔍 Total steps in turn: {len(steps)}")
+    steps = getattr(turn, "steps", None) or ()
+    if _DEBUG_ENABLED:
+        logger.debug(
+            "%s Total steps in turn: %d (%s)", _LOG_TAG, len(steps),
+            ", ".join(f"{idx}:{_step_type(step)}" for idx, step in enumerate(steps))
+        )
 
     for idx, step in enumerate(steps):
-        step_type = getattr(step, "step_type", type(step).__name__).lower()
-        logger.debug(f"Step {idx}: {step_type}")
-        if "tool" in step_type:
-            logger.info(f"🔧 Found tool_execution step at idx={idx}")
+        if _step_type(step) in _TOOL_STEP_TYPES:
+            logger.info("%s Found tool_execution step at idx=%d", _TOOL_TAG, idx)
             # Extract tool_responses (list)
             for tr_idx, tool_response in enumerate(getattr(step, "tool_responses", [])):
                 content = getattr(tool_response, "content", "")
                 # Typical MCP wrapper: {"type":"text","text":"{...json...}"}
                 try:
-                    parsed = json.loads(content)
+                    parsed = _json_loads(content)
                     if isinstance(parsed, dict) and "text" in parsed:
-                        inner = json.loads(parsed["text"])
-                        logger.info(f" Parsed MCP tool response at step {idx}, tool_response {tr_idx}")
+                        inner = _json_loads(parsed["text"])
+                        logger.info(" Parsed MCP tool response at step %d, tool_response %d", idx, tr_idx)
                         return inner  # Found the canonical result!
                     elif isinstance(parsed, dict) and ("output" in parsed or "tool" in parsed):
-                        logger.info(f" Parsed MCP tool response at step {idx}, tool_response {tr_idx}")
+                        logger.info(" Parsed MCP tool response at step %d, tool_response %d", idx, tr_idx)
                         return parsed
                 except Exception as e:
-                    logger.warning(f"Failed to parse tool response content as JSON: {e}")
+                    logger.warning("Failed to parse tool response content as JSON: %s", e)
             # If we got here, but couldn't parse, continue searching
         # Ignore "inference" steps after tool_execution!
-    logger.warning("⚠️ No MCP tool_execution result found in turn steps.")
+    logger.warning("%s No MCP tool_execution result found in turn steps.", _TOOL_TAG)
     return None
 
 
+def _format_lint_issue(issue: Any) -> str:
+    """Render one lint issue as '[SEVERITY] rule: message'."""
+    if not isinstance(issue, dict):
+        return str(issue)
+    get = issue.get
+    return f"[{get('severity', '').upper()}] {get('rule', '')}: {get('message', '')}"
+
+
+def _parse_lint_output(tool_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Maps an MCP ansible-lint result onto the summary/issue fields of a validation response.
+    Pure function of its input, so it can be reused or compiled independently.
+    """
+    output = tool_result.get("output", {})
+    summary = output.get("summary", {})
+    issues = output.get("issues", [])
+    raw_output = output.get("raw_output", {})
+    stdout = raw_output.get("stdout", "")
+    stderr = raw_output.get("stderr", "")
+
+    return {
+        "summary": summary,
+        "issues_count": summary.get("issue_count", len(issues)),
+        "issues": issues,
+        "formatted_issues": "\n".join(map(_format_lint_issue, issues)) if issues else (stdout or "No issues found."),
+        "passed": summary.get("passed", False),
+        "raw_stdout": stdout,
+        "raw_stderr": stderr,
+    }
+
+
 class ValidationAgent:
     """
     ValidationAgent: Ansible playbook validator using MCP ansible-lint tool.
     Always returns the tool output, never post-tool hallucinations.
+    The injected client should share a pooled httpx transport (see main.lifespan) so
+    concurrent sessions and turns reuse connections instead of reconnecting per call.
     """
 
     def __init__(
@@ -59,21 +166,44 @@ class ValidationAgent:
         prompt_template: str,    # From config
         instruction: str,        # From config
         timeout: int = 60, 
-        verbose_logging: bool = False
+        verbose_logging: bool = False,
+        max_concurrent_validations: int = 8,
+        result_cache_size: int = 128,
+        result_cache_ttl: float = 300.0
     ):
-        logger.info(f"🚀 Initializing ValidationAgent")
+        logger.info("%s Initializing ValidationAgent", _LOG_TAG)
         self.client = client
         self.agent_id = agent_id
         self.session_id = session_id
         self.prompt_template = prompt_template
+        self._playbook_field = self._resolve_playbook_field(prompt_template)
         self.instruction = instruction
         self.timeout = timeout
         self.verbose_logging = verbose_logging
+        self.max_concurrent_validations = max_concurrent_validations
+        # Shared across calls so concurrent batch requests together respect the MCP limit
+        self._concurrency = asyncio.Semaphore(max_concurrent_validations)
+        self.result_cache_size = result_cache_size
+        self.result_cache_ttl = result_cache_ttl
+        self._result_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.health_cache_seconds = 5
+        self._last_health_ts = float("-inf")
+        self._last_health_result = False
         self.logger = logger
         if verbose_logging:
             self.logger.setLevel(logging.DEBUG)
+            refresh_log_level()
         self.supported_profiles = ["basic", "moderate", "safety", "shared", "production"]
-        self.logger.info(f"ValidationAgent initialized with agent_id: {agent_id}")
+        self._status_template = {
+            "agent_id": agent_id,
+            "session_id": session_id,
+            "client_base_url": getattr(client, 'base_url', 'unknown'),
+            "timeout": timeout,
+            "pattern": _SESSION_PATTERN,
+            "tool": LINT_TOOLGROUP,
+            "supported_profiles": self.supported_profiles
+        }
+        self.logger.info("ValidationAgent initialized with agent_id: %s", agent_id)
 
     def create_new_session(self, correlation_id: str) -> str:
         try:
@@ -83,36 +213,36 @@ class ValidationAgent:
                 session_name=session_name,
             )
             session_id = response.session_id
-            self.logger.info(f"📱 Created new session: {session_id} for correlation: {correlation_id}")
+            self.logger.info("%s Created new session: %s for correlation: %s", _LOG_TAG, session_id, correlation_id)
             return session_id
         except Exception as e:
-            self.logger.error(f"Failed to create session: {e}")
-            self.logger.info(f"↩️ Falling back to default session: {self.session_id}")
+            self.logger.error("Failed to create session: %s", e)
+            self.logger.info("%s Falling back to default session: %s", _LOG_TAG, self.session_id)
             return self.session_id
 
     def _build_validation_prompt(self, playbook_content: str, profile: str) -> str:
         """Build validation prompt using config-driven template and instruction."""
         try:
-            return self.prompt_template.format(
-                instruction=self.instruction,
-                playbook_content=playbook_content.strip(),
-                profile=profile
-            )
-        except KeyError as e:
-            logger.warning(f"Template parameter {e} not found, trying alternative format...")
-            try:
-                return self.prompt_template.format(
-                    instruction=self.instruction,
-                    playbook=playbook_content.strip(),
-                    profile=profile
-                )
-            except Exception as e2:
-                logger.error(f"Error formatting validation prompt from config: {e2}. Falling back to safe template.")
-                return self._build_fallback_prompt(playbook_content, profile)
+            return self.prompt_template.format_map({
+                "instruction": self.instruction,
+                self._playbook_field: playbook_content.strip(),
+                "profile": profile
+            })
         except Exception as e:
-            logger.error(f"Error formatting validation prompt from config: {e}. Falling back to safe template.")
+            logger.error("Error formatting validation prompt from config: %s. Falling back to safe template.", e)
             return self._build_fallback_prompt(playbook_content, profile)
 
+    @staticmethod
+    def _resolve_playbook_field(prompt_template: str) -> str:
+        """Pick the placeholder the template uses for the playbook: 'playbook_content' or legacy 'playbook'."""
+        try:
+            fields = {name for _, name, _, _ in string.Formatter().parse(prompt_template) if name}
+        except ValueError:
+            return "playbook_content"
+        if "playbook_content" not in fields and "playbook" in fields:
+            return "playbook"
+        return "playbook_content"
+
     def _build_fallback_prompt(self, playbook_content: str, profile: str) -> str:
         return f"""{self.instruction}
 
@@ -125,147 +255,218 @@ Use the lint_ansible_playbook tool with {profile} profile to check this playbook
         self, 
         playbook_content: str, 
         profile: str = "basic", 
-        correlation_id: Optional[str] = None
+        correlation_id: Optional[str] = None,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
+        """
+        Validate a playbook via the MCP ansible-lint tool.
+        If on_event is given, it receives progress dicts (see _progress_event) as the turn streams;
+        it is called from a worker thread.
+        """
         correlation_id = correlation_id or str(uuid.uuid4())
         start_time = time.time()
         if profile not in self.supported_profiles:
             raise ValueError(f"Unsupported profile: {profile}. Supported: {self.supported_profiles}")
-        self.logger.info(f"🔍 Validating playbook with {profile} profile (correlation: {correlation_id})")
+        if not playbook_content or playbook_content.isspace():
+            return self._empty_result(correlation_id, profile, elapsed_time=0.0)
+        cache_key = self._cache_key(playbook_content, profile)
+        cached = self._get_cached_result(cache_key, correlation_id)
+        if cached is not None:
+            self.logger.info("%s Returning cached %s validation (correlation: %s)", _LOG_TAG, profile, correlation_id)
+            return cached
+        self.logger.info("%s Validating playbook with %s profile (correlation: %s)", _LOG_TAG, profile, correlation_id)
         try:
-            query_session_id = self.create_new_session(correlation_id)
+            query_session_id = await asyncio.to_thread(self.create_new_session, correlation_id)
             user_prompt = self._build_validation_prompt(playbook_content, profile)
             
-            if self.verbose_logging:
-                self.logger.debug(f"Built validation prompt: {user_prompt[:500]}...")
-            
-            messages = [UserMessage(role="user", content=user_prompt)]
-
-            generator = self.client.agents.turn.create(
-                agent_id=self.agent_id,
-                session_id=query_session_id,
-                messages=messages,
-                stream=True,
-            )
+            if self.verbose_logging and _DEBUG_ENABLED:
+                self.logger.debug("Built validation prompt: %.500s...", user_prompt)
 
-            turn = None
-            timeout_seconds = self.timeout
-            timeout_start = time.time()
-            chunk_count = 0
-            last_event_time = timeout_start
-            
-            for chunk in generator:
-                chunk_count += 1
-                current_time = time.time()
-                if current_time - last_event_time > 20 or current_time - timeout_start > timeout_seconds:
-                    self.logger.error("⏰ Validation timeout or event delay.")
-                    break
-                last_event_time = current_time
-
-                if hasattr(chunk, 'event') and hasattr(chunk.event, 'payload'):
-                    event = chunk.event
-                    event_type = getattr(event.payload, 'event_type', 'unknown')
-                    if event_type == "turn_complete":
-                        turn = event.payload.turn
-                        self.logger.info(f" Turn completed after {current_time - timeout_start:.1f}s with {chunk_count} chunks")
-                        break
+            # The sync client blocks while streaming, so drain the turn off the event loop
+            turn, chunk_count = await asyncio.to_thread(self._run_turn, query_session_id, user_prompt, on_event)
 
             if not turn:
-                self.logger.error(f" No turn completed in response after {chunk_count} chunks")
-                return {
-                    "success": False,
-                    "correlation_id": correlation_id,
-                    "profile": profile,
-                    "error": f"Turn never completed after {chunk_count} chunks.",
-                    "summary": {"passed": False, "exit_code": -1},
-                    "issues_count": 0,
-                    "issues": [],
-                    "formatted_issues": "Agent turn never completed. This suggests the MCP tool is not responding or the agent is stuck.",
-                    "elapsed_time": time.time() - start_time,
-                    "timeout": True,
-                    "debug_info": {
+                self.logger.error(" No turn completed in response after %d chunks", chunk_count)
+                return self._failure_result(
+                    correlation_id, profile,
+                    error=f"Turn never completed after {chunk_count} chunks.",
+                    formatted_issues="Agent turn never completed. This suggests the MCP tool is not responding or the agent is stuck.",
+                    elapsed_time=time.time() - start_time,
+                    summary={"passed": False, "exit_code": -1},
+                    timeout=True,
+                    debug_info={
                         "chunk_count": chunk_count,
                         "agent_stuck": True
                     }
-                }
+                )
             
             # --- Main Fix: Return only the MCP tool result ---
             result = await self._process_validation_response(turn, correlation_id, profile, time.time() - start_time)
+            if "tool_response" in result:
+                self._store_cached_result(cache_key, result)
             return result
         except TimeoutError as e:
-            return {
-                "success": False,
-                "correlation_id": correlation_id,
-                "profile": profile,
-                "error": f"Validation timeout: {str(e)}",
-                "summary": {"passed": False},
-                "issues_count": 0,
-                "issues": [],
-                "formatted_issues": "Validation timed out",
-                "elapsed_time": time.time() - start_time,
-                "timeout": True
-            }
+            return self._failure_result(
+                correlation_id, profile,
+                error=f"Validation timeout: {str(e)}",
+                formatted_issues="Validation timed out",
+                elapsed_time=time.time() - start_time,
+                timeout=True
+            )
         except Exception as e:
-            return {
-                "success": False,
-                "correlation_id": correlation_id,
-                "profile": profile,
-                "error": str(e),
-                "summary": {"passed": False},
-                "issues_count": 0,
-                "issues": [],
-                "formatted_issues": f"Validation failed: {str(e)}",
-                "elapsed_time": time.time() - start_time
-            }
+            return self._failure_result(
+                correlation_id, profile,
+                error=str(e),
+                formatted_issues=f"Validation failed: {str(e)}",
+                elapsed_time=time.time() - start_time
+            )
+
+    @staticmethod
+    def _cache_key(playbook_content: str, profile: str) -> Tuple[str, str]:
+        digest = hashlib.blake2b(playbook_content.encode("utf-8"), digest_size=16).hexdigest()
+        return digest, profile
+
+    def _get_cached_result(self, key: Tuple[str, str], correlation_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a fresh cached lint result re-stamped for this request, or None."""
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.result_cache_ttl:
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        result = copy.deepcopy(result)
+        result["correlation_id"] = correlation_id
+        result["elapsed_time"] = 0.0
+        result["cached"] = True
+        return result
+
+    def _store_cached_result(self, key: Tuple[str, str], result: Dict[str, Any]) -> None:
+        """Cache results that came from the MCP tool; evicts least recently used beyond result_cache_size."""
+        if self.result_cache_size <= 0:
+            return
+        self._result_cache[key] = (time.monotonic(), copy.deepcopy(result))
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self.result_cache_size:
+            self._result_cache.popitem(last=False)
+
+    def _run_turn(
+        self,
+        session_id: str,
+        user_prompt: str,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Tuple[Optional[Any], int]:
+        """Stream a validation turn to completion; returns (turn or None, chunks seen)."""
+        messages = ({"role": "user", "content": user_prompt},)
+
+        generator = self.client.agents.turn.create(
+            agent_id=self.agent_id,
+            session_id=session_id,
+            messages=messages,
+            stream=True,
+        )
+
+        turn = None
+        timeout_seconds = self.timeout
+        timeout_start = time.monotonic()
+        chunk_count = 0
+        last_event_time = timeout_start
+        
+        try:
+            for chunk in generator:
+                chunk_count += 1
+                current_time = time.monotonic()
+                if current_time - last_event_time > 20 or current_time - timeout_start > timeout_seconds:
+                    self.logger.error("%s Validation timeout or event delay.", _LOG_TAG)
+                    break
+                last_event_time = current_time
+
+                payload = getattr(getattr(chunk, 'event', None), 'payload', None)
+                if payload is not None:
+                    if on_event is not None:
+                        progress = _progress_event(payload)
+                        if progress is not None:
+                            on_event(progress)
+                    event_type = getattr(payload, 'event_type', 'unknown')
+                    if event_type == _TURN_COMPLETE:
+                        turn = payload.turn
+                        self.logger.info(" Turn completed after %.1fs with %d chunks", current_time - timeout_start, chunk_count)
+                        break
+        finally:
+            # Release the streaming HTTP response as soon as we stop reading
+            close = getattr(generator, "close", None)
+            if close is not None:
+                close()
+        return turn, chunk_count
 
     async def _process_validation_response(self, turn, correlation_id: str, profile: str, elapsed_time: float) -> Dict[str, Any]:
         tool_result = extract_mcp_tool_result(turn)
         if tool_result:
-            output = tool_result.get("output", {})
-            summary = output.get("summary", {})
-            issues = output.get("issues", [])
-            raw_output = output.get("raw_output", {})
-
             return {
                 "success": tool_result.get("success", True),
                 "correlation_id": correlation_id,
                 "profile": profile,
-                "summary": summary,
-                "issues_count": summary.get("issue_count", len(issues)),
-                "issues": issues,
-                "formatted_issues": "\n".join(
-                    f"[{i.get('severity','').upper()}] {i.get('rule','')}: {i.get('message','')}" for i in issues
-                ) if issues else (raw_output.get("stdout", "") or "No issues found."),
-                "passed": summary.get("passed", False),
-                "raw_stdout": raw_output.get("stdout", ""),
-                "raw_stderr": raw_output.get("stderr", ""),
+                **_parse_lint_output(tool_result),
                 "tool_response": tool_result,
-                "tool": tool_result.get("tool", "mcp::ansible_lint"),
+                "tool": tool_result.get("tool", LINT_TOOLGROUP),
                 "elapsed_time": elapsed_time,
                 "session_info": {
                     "agent_id": self.agent_id,
-                    "pattern": "Registry-based"
+                    "pattern": _SESSION_PATTERN
                 }
             }
         else:
-            return {
-                "success": False,
-                "correlation_id": correlation_id,
-                "profile": profile,
-                "error": "No MCP tool_execution result found in agent response.",
-                "summary": {"passed": False},
-                "issues_count": 0,
-                "issues": [],
-                "formatted_issues": "No MCP tool_execution result found.",
-                "elapsed_time": elapsed_time,
-                "session_info": {
+            return self._failure_result(
+                correlation_id, profile,
+                error="No MCP tool_execution result found in agent response.",
+                formatted_issues="No MCP tool_execution result found.",
+                elapsed_time=elapsed_time,
+                session_info={
                     "agent_id": self.agent_id,
-                    "pattern": "Registry-based"
+                    "pattern": _SESSION_PATTERN
                 },
-                "debug_info": {}
+                debug_info={}
+            )
+
+    @staticmethod
+    def _failure_result(
+        correlation_id: str,
+        profile: str,
+        error: str,
+        formatted_issues: str,
+        elapsed_time: Optional[float] = None,
+        **extra: Any
+    ) -> Dict[str, Any]:
+        """Common envelope for a failed validation; extra keys are merged last and may override."""
+        result = {
+            "success": False,
+            "correlation_id": correlation_id,
+            "profile": profile,
+            "error": error,
+            "summary": {"passed": False},
+            "issues_count": 0,
+            "issues": [],
+            "formatted_issues": formatted_issues,
+        }
+        if elapsed_time is not None:
+            result["elapsed_time"] = elapsed_time
+        result.update(extra)
+        return result
+
+    def _empty_result(self, correlation_id: str, profile: str, elapsed_time: float) -> Dict[str, Any]:
+        """Result for blank input, returned without calling the MCP tool."""
+        return self._failure_result(
+            correlation_id, profile,
+            error="empty playbook",
+            formatted_issues="Playbook content is empty.",
+            elapsed_time=elapsed_time,
+            session_info={
+                "agent_id": self.agent_id,
+                "pattern": _SESSION_PATTERN
             }
+        )
 
-    # --- Utility Methods (Unchanged) ---
     async def validate_playbook_stream(
         self, 
         playbook_content: str, 
@@ -281,10 +482,38 @@ Use the lint_ansible_playbook tool with {profile} profile to check this playbook
                 "agent_info": {
                     "agent_id": self.agent_id,
                     "correlation_id": correlation_id,
-                    "pattern": "Registry-based"
+                    "pattern": _SESSION_PATTERN
                 }
             }
-            result = await self.validate_playbook(playbook_content, profile, correlation_id)
+            events: asyncio.Queue = asyncio.Queue()
+            loop = asyncio.get_running_loop()
+
+            def on_event(event: Dict[str, Any]) -> None:
+                # Called from the worker thread draining the turn stream
+                loop.call_soon_threadsafe(events.put_nowait, event)
+
+            validation = asyncio.ensure_future(
+                self.validate_playbook(playbook_content, profile, correlation_id, on_event=on_event)
+            )
+            next_event = None
+            try:
+                while not validation.done():
+                    next_event = asyncio.ensure_future(events.get())
+                    await asyncio.wait({next_event, validation}, return_when=asyncio.FIRST_COMPLETED)
+                    if not next_event.done():
+                        next_event.cancel()
+                        break
+                    yield {**next_event.result(), "correlation_id": correlation_id}
+                while not events.empty():
+                    yield {**events.get_nowait(), "correlation_id": correlation_id}
+                result = validation.result()
+            finally:
+                # A disconnecting consumer cancels us inside asyncio.wait;
+                # don't leave the pending Queue.get() task behind.
+                if next_event is not None and not next_event.done():
+                    next_event.cancel()
+                if not validation.done():
+                    validation.cancel()
             yield {
                 "type": "final_result",
                 "data": result,
@@ -325,33 +554,50 @@ Use the lint_ansible_playbook tool with {profile} profile to check this playbook
         profile: str = "basic",
         correlation_id: Optional[str] = None
     ) -> Dict[str, Dict[str, Any]]:
+        results = {
+            filename: result
+            async for filename, result in self.validate_multiple_files_stream(files, profile, correlation_id)
+        }
+        # The stream yields in completion order; keep the caller's file order
+        return {filename: results[filename] for filename in files}
+
+    async def validate_multiple_files_stream(
+        self, 
+        files: Dict[str, str], 
+        profile: str = "basic",
+        correlation_id: Optional[str] = None
+    ) -> AsyncGenerator[Tuple[str, Dict[str, Any]], None]:
+        """Yield (filename, result) pairs as each file's validation completes."""
         correlation_id = correlation_id or str(uuid.uuid4())
-        results = {}
-        for filename, content in files.items():
-            self.logger.info(f"🔍 Validating file: {filename}")
+        async def _validate_one(filename: str, content: str):
             file_correlation = f"{correlation_id}-{filename}"
-            try:
-                result = await self.validate_playbook(content, profile, file_correlation)
-                result["filename"] = filename
-                results[filename] = result
-            except Exception as e:
-                self.logger.error(f"Failed to validate {filename}: {e}")
-                results[filename] = {
-                    "success": False,
-                    "filename": filename,
-                    "correlation_id": file_correlation,
-                    "error": str(e),
-                    "summary": {"passed": False},
-                    "issues_count": 0,
-                    "issues": [],
-                    "formatted_issues": f"Failed to validate {filename}: {str(e)}"
-                }
-        return results
+            async with self._concurrency:
+                self.logger.info("%s Validating file: %s", _LOG_TAG, filename)
+                try:
+                    result = await self.validate_playbook(content, profile, file_correlation)
+                    result["filename"] = filename
+                    return filename, result
+                except Exception as e:
+                    self.logger.error("Failed to validate %s: %s", filename, e)
+                    return filename, self._failure_result(
+                        file_correlation, profile,
+                        error=str(e),
+                        formatted_issues=f"Failed to validate {filename}: {str(e)}",
+                        filename=filename
+                    )
+
+        tasks = [asyncio.ensure_future(_validate_one(filename, content)) for filename, content in files.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def debug_tools(self) -> Dict[str, Any]:
         try:
             simple_prompt = "What tools do you have available? List all your tools."
-            messages = [UserMessage(role="user", content=simple_prompt)]
+            messages = ({"role": "user", "content": simple_prompt},)
             generator = self.client.agents.turn.create(
                 agent_id=self.agent_id,
                 session_id=self.session_id,
@@ -361,17 +607,19 @@ Use the lint_ansible_playbook tool with {profile} profile to check this playbook
             turn = None
             events_seen = []
             for chunk in generator:
-                event = chunk.event
-                event_type = event.payload.event_type
+                payload = chunk.event.payload
+                event_type = payload.event_type
                 events_seen.append(event_type)
-                if event_type == "turn_complete":
-                    turn = event.payload.turn
+                if event_type == _TURN_COMPLETE:
+                    turn = payload.turn
                     break
+            steps = getattr(turn, 'steps', None)
+            output_message = getattr(turn, 'output_message', None)
             tool_info = {
                 "turn_completed": turn is not None,
                 "events_seen": events_seen,
-                "steps_count": len(turn.steps) if turn and hasattr(turn, 'steps') else 0,
-                "output_message": turn.output_message.content if turn and hasattr(turn, 'output_message') and turn.output_message else None
+                "steps_count": len(steps) if steps else 0,
+                "output_message": output_message.content if output_message else None
             }
             return tool_info
         except Exception as e:
@@ -379,20 +627,7 @@ Use the lint_ansible_playbook tool with {profile} profile to check this playbook
 
     async def test_tool_availability(self) -> Dict[str, Any]:
         try:
-            test_playbook = """---
-- name: Simple test
-  hosts: localhost
-  tasks:
-    - name: Debug task
-      debug:
-        msg: "test"
-"""
-            tool_prompt = f"""Use the lint_ansible_playbook tool to check this playbook:
-
-{test_playbook}
-
-Call the ansible-lint tool now."""
-            messages = [UserMessage(role="user", content=tool_prompt)]
+            messages = ({"role": "user", "content": _TOOL_TEST_PROMPT},)
             generator = self.client.agents.turn.create(
                 agent_id=self.agent_id,
                 session_id=self.session_id,
@@ -411,19 +646,20 @@ Call the ansible-lint tool now."""
                         "events_seen": events_seen,
                         "tool_events": tool_events
                     }
-                event = chunk.event
-                event_type = event.payload.event_type
+                payload = chunk.event.payload
+                event_type = payload.event_type
                 events_seen.append(event_type)
                 if "tool" in event_type.lower():
                     tool_events.append(event_type)
-                if event_type == "turn_complete":
-                    turn = event.payload.turn
+                if event_type == _TURN_COMPLETE:
+                    turn = payload.turn
                     break
             has_tool_steps = False
-            if turn and hasattr(turn, 'steps'):
-                for step in turn.steps:
-                    step_type = getattr(step, "step_type", type(step).__name__)
-                    if "tool" in step_type.lower():
+            steps = getattr(turn, 'steps', None)
+            if steps:
+                for step in steps:
+                    step_type = _step_type(step)
+                    if step_type in _TOOL_STEP_TYPES:
                         has_tool_steps = True
                         break
             return {
@@ -432,48 +668,35 @@ Call the ansible-lint tool now."""
                 "events_seen": events_seen,
                 "tool_events": tool_events,
                 "has_tool_steps": has_tool_steps,
-                "steps_count": len(turn.steps) if turn and hasattr(turn, 'steps') else 0,
+                "steps_count": len(steps) if steps else 0,
                 "elapsed_time": time.time() - timeout_start
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    async def _ping_mcp(self) -> bool:
+        """Cheap probe: confirm the ansible-lint MCP toolgroup is registered with LlamaStack."""
+        toolgroup = await asyncio.to_thread(self.client.toolgroups.get, toolgroup_id=LINT_TOOLGROUP)
+        return toolgroup is not None
+
     async def health_check(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_health_ts < self.health_cache_seconds:
+            return self._last_health_result
         try:
-            test_playbook = """---
-- name: Health check playbook
-  hosts: localhost
-  tasks:
-    - name: Test task
-      debug:
-        msg: "Health check"
-"""
-            result = await self.validate_playbook(test_playbook, "basic", "health-check")
-            return result.get("success") is not None
+            healthy = await self._ping_mcp()
         except Exception as e:
-            self.logger.error(f"Validation health check failed: {e}")
-            return False
+            self.logger.error("Validation health check failed: %s", e)
+            healthy = False
+        self._last_health_ts = now
+        self._last_health_result = healthy
+        return healthy
 
     def get_status(self) -> Dict[str, Any]:
-        return {
-            "agent_id": self.agent_id,
-            "session_id": self.session_id,
-            "client_base_url": getattr(self.client, 'base_url', 'unknown'),
-            "timeout": self.timeout,
-            "status": "ready",
-            "pattern": "Registry-based",
-            "tool": "mcp::ansible_lint",
-            "supported_profiles": self.supported_profiles
-        }
+        return {**self._status_template, "status": "ready"}
 
     def get_supported_profiles(self) -> List[str]:
         return self.supported_profiles.copy()
 
     def get_profile_descriptions(self) -> Dict[str, str]:
-        return {
-            "basic": "Basic syntax and structure validation",
-            "moderate": "Standard best practices checking", 
-            "safety": "Security-focused validation rules",
-            "shared": "Rules for shared/reusable playbooks",
-            "production": "Strict production-ready validation"
-        }
+        return dict(_PROFILE_DESCRIPTIONS)
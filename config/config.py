@@ -1,6 +1,146 @@
+import hashlib
+import json
+import mmap
+import os
+import tempfile
 import yaml
 import re
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Matches an instructions value that references the agent_instructions section.
+_INSTR_RE = re.compile(r"\{agent_instructions\.([^}]+)\}")
+
+# Agent names that YAML nulls or placeholder values turn into; never valid.
+RESERVED_AGENT_NAMES = frozenset({"none", "null", ""})
+
+# Parsed config files keyed by absolute path -> (mtime_ns, size, parsed dict).
+# Every ConfigLoader in the process shares this, so the same config.yaml is
+# only parsed again when it actually changes on disk.
+_yaml_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+
+def load_yaml_cached(path: str) -> Any:
+    """
+    Returns the parsed YAML for `path`, re-parsing only when its mtime or size
+    changed since the last load. The returned object is shared; treat it as read-only.
+    """
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    cached = _yaml_cache.get(abs_path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    parsed = _load_yaml_file(abs_path)
+    _yaml_cache[abs_path] = (st.st_mtime_ns, st.st_size, parsed)
+    return parsed
+
+
+def _load_yaml_file(abs_path: str) -> Any:
+    """
+    Hashes the file's bytes and returns the JSON sidecar's copy when it was
+    written for the same content, else parses the YAML and refreshes the sidecar.
+    On Linux a non-empty file is mapped with MAP_POPULATE so the page cache is
+    filled in one go and both blake2b and libyaml read the mapping directly.
+    """
+    with open(abs_path, "rb") as f:
+        if hasattr(mmap, "MAP_POPULATE") and os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, flags=mmap.MAP_PRIVATE | mmap.MAP_POPULATE,
+                           prot=mmap.PROT_READ) as mm:
+                return _load_yaml_bytes(abs_path, mm)
+        return _load_yaml_bytes(abs_path, f.read())
+
+
+def _load_yaml_bytes(abs_path: str, data) -> Any:
+    """`data` is the file's bytes or an mmap of them."""
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    parsed = _load_json_sidecar(abs_path, digest)
+    if parsed is None:
+        parsed = yaml.load(data, Loader=_YamlLoader)
+        _write_json_sidecar(abs_path, digest, parsed)
+    return parsed
+
+
+def _sidecar_dir() -> Optional[str]:
+    """
+    Per-user cache directory for the JSON sidecars: $CONFIG_CACHE_DIR, else
+    $XDG_CACHE_HOME/x2a-api, else <tmp>/x2a-api-<uid>. Never the config's own
+    directory, which may be a read-only mount or a source checkout. Returns
+    None when the directory cannot be created or is not owned by this user.
+    """
+    directory = os.getenv("CONFIG_CACHE_DIR")
+    if not directory:
+        xdg = os.getenv("XDG_CACHE_HOME")
+        if xdg:
+            directory = os.path.join(xdg, "x2a-api")
+        else:
+            uid = os.getuid() if hasattr(os, "getuid") else "user"
+            directory = os.path.join(tempfile.gettempdir(), f"x2a-api-{uid}")
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if hasattr(os, "getuid") and os.stat(directory).st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    return directory
+
+
+def _sidecar_path(abs_path: str) -> Optional[str]:
+    """/etc/x2a-api/config.yaml -> <cache dir>/config.yaml-<hash of the absolute path>.json"""
+    directory = _sidecar_dir()
+    if directory is None:
+        return None
+    key = hashlib.blake2b(abs_path.encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(directory, f"{os.path.basename(abs_path)}-{key}.json")
+
+
+def _load_json_sidecar(abs_path: str, digest: str) -> Optional[Any]:
+    """Loads the JSON copy of the config if it was written for the same YAML content."""
+    sidecar = _sidecar_path(abs_path)
+    if sidecar is None:
+        return None
+    try:
+        with open(sidecar, "rb") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("blake2b") != digest
+    ):
+        return None
+    return cached.get("config")
+
+
+def _write_json_sidecar(abs_path: str, digest: str, parsed: Any) -> None:
+    """
+    Best-effort write of a JSON copy of the parsed YAML for faster loads on the
+    next start, stamped with the blake2b digest of the YAML bytes. Skipped when the content
+    does not survive a JSON round trip (dates, non-string keys, ...) or no
+    usable cache directory is available.
+    """
+    sidecar = _sidecar_path(abs_path)
+    if sidecar is None:
+        return
+    try:
+        if json.loads(json.dumps(parsed)) != parsed:
+            return
+        payload = json.dumps({"blake2b": digest, "config": parsed})
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(sidecar), prefix=".config-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp, sidecar)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except (OSError, TypeError, ValueError):
+        pass
+
 
 class ConfigLoader:
     """
@@ -14,20 +154,20 @@ class ConfigLoader:
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = config_path
         self.config = self._load_config()
+        self._instructions_map: Optional[Dict[str, str]] = None
         self._agents = self._validate_and_interpolate()
 
     def _load_config(self) -> Dict[str, Any]:
         """Loads and parses the YAML config file."""
         try:
-            with open(self.config_path, "r") as f:
-                config = yaml.safe_load(f)
+            config = load_yaml_cached(self.config_path)
             if not config:
                 raise ValueError("Config file is empty or invalid.")
             return config
         except Exception as e:
             raise RuntimeError(f"Failed to load config file '{self.config_path}': {e}")
 
-    def _validate_and_interpolate(self) -> List[Dict[str, Any]]:
+    def _validate_and_interpolate(self) -> Tuple[Dict[str, Any], ...]:
         """Validates config and interpolates agent_instructions into agents."""
         # Validate llamastack section
         if "llamastack" not in self.config or "base_url" not in self.config["llamastack"]:
@@ -39,10 +179,12 @@ class ConfigLoader:
         instr_map = self.config.get("agent_instructions", {})
         out: List[Dict[str, Any]] = []
         for agent in self.config["agents"]:
-            agent = dict(agent)  # Shallow copy
+            name = agent.get("name")
+            if not isinstance(name, str) or name.lower() in RESERVED_AGENT_NAMES:
+                raise ValueError(f"Agent entry has an invalid or missing 'name': {name!r}")
             instr = agent.get("instructions", "")
             # Interpolate instructions if referencing agent_instructions
-            m = re.match(r"\{agent_instructions\.([^\}]+)\}", instr)
+            m = _INSTR_RE.match(instr) if "{" in instr else None
             if m:
                 key = m.group(1)
                 resolved = instr_map.get(key)
@@ -51,9 +193,14 @@ class ConfigLoader:
                         f"Instruction reference '{{agent_instructions.{key}}}' for agent '{agent.get('name')}' "
                         f"not found in 'agent_instructions' section."
                     )
-                agent["instructions"] = resolved
+                # Copy only when interpolating so the shared parsed config stays untouched
+                agent = {**agent, "instructions": resolved}
             out.append(agent)
-        return out
+        # Name index for get_agent_config; first definition wins, as with the old scan
+        self._agents_by_name: Dict[str, Dict[str, Any]] = {}
+        for agent in out:
+            self._agents_by_name.setdefault(agent["name"], agent)
+        return tuple(out)
 
     def get_llamastack_base_url(self) -> str:
         """Returns LlamaStack API base URL from config."""
@@ -63,7 +210,7 @@ class ConfigLoader:
         """Returns the default LlamaStack model name from config."""
         return self.config["llamastack"].get("default_model", "llama3-8b-instruct")
 
-    def get_agents_config(self) -> List[Dict[str, Any]]:
+    def get_agents_config(self) -> Tuple[Dict[str, Any], ...]:
         """
         Returns the interpolated agent configurations (instructions expanded!).
         This is what you should use to instantiate all agents.
@@ -72,19 +219,33 @@ class ConfigLoader:
 
     def get_agent_instructions(self, agent_name: str) -> Optional[str]:
         """Returns the instructions string for the named agent, if defined."""
-        return self.config.get("agent_instructions", {}).get(agent_name)
+        if self._instructions_map is None:
+            self._instructions_map = self.config.get("agent_instructions", {})
+        return self._instructions_map.get(agent_name)
 
     def get_agent_config(self, agent_name: str) -> Optional[Dict[str, Any]]:
         """
         Returns the full config dictionary for a specific agent (by name).
         """
-        for agent in self._agents:
-            if agent.get("name") == agent_name:
-                return agent
-        return None
+        return self._agents_by_name.get(agent_name)
 
     def get_prompt_template(self, prompt_name: str) -> Optional[str]:
         """
         Returns the string template for a given prompt name (from 'prompts' section).
         """
         return self.config.get("prompts", {}).get(prompt_name)
+
+
+@lru_cache(maxsize=8)
+def _cached_config_loader(abs_path: str, mtime_ns: int, size: int) -> ConfigLoader:
+    return ConfigLoader(abs_path)
+
+
+def get_config_loader(config_path: str = "config.yaml") -> ConfigLoader:
+    """
+    Returns a shared ConfigLoader for `config_path`. Repeated calls get the same
+    instance until the file's mtime or size changes.
+    """
+    abs_path = os.path.abspath(config_path)
+    st = os.stat(abs_path)
+    return _cached_config_loader(abs_path, st.st_mtime_ns, st.st_size)
@@ -1,10 +1,21 @@
+import asyncio
 import logging
+import logging.handlers
 import os
+import queue
 import json
+import secrets
 import uuid
+import httpx
 from fastapi import FastAPI
+from pydantic import BaseModel
+from typing import Any, Dict, NamedTuple, Optional
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
+from llama_stack_client import LlamaStackClient
+from llama_stack_client.types.agent_create_params import AgentConfig
+from llama_stack_client.lib.agents.react.agent import ReActAgent
+from llama_stack_client.lib.agents.react.tool_parser import ReActOutput
 
 from routes.admin import router as admin_router
 from routes.chef import router as chef_router
@@ -19,7 +30,12 @@ from routes.vector_db import router as vector_db_router
 from routes.ansible_upgrade import router as ansible_upgrade_router
 
 from agents.agent import AgentManager
-from config.config import ConfigLoader
+from agents.chef_analysis.agent import ChefAnalysisAgent
+from agents.bladelogic_analysis.agent import BladeLogicAnalysisAgent
+from agents.shell_analysis.agent import ShellAnalysisAgent
+from agents.salt_analysis.agent import SaltAnalysisAgent
+from agents.ansible_upgrade.agent import AnsibleUpgradeAnalysisAgent
+from config.config import get_config_loader, RESERVED_AGENT_NAMES
 from agents.context_agent.context_agent import ContextAgent
 from agents.code_generator.code_generator_agent import CodeGeneratorAgent
 from agents.validate.validate_agent import ValidationAgent
@@ -32,83 +48,106 @@ logging.basicConfig(
 )
 logger = logging.getLogger("main")
 
-config_loader = ConfigLoader("config.yaml")
+config_loader = get_config_loader("config.yaml")
 llamastack_base_url = config_loader.get_llamastack_base_url()
-agents_config = config_loader.get_agents_config()
 
-from llama_stack_client import LlamaStackClient
-from llama_stack_client.types.agent_create_params import AgentConfig
-from llama_stack_client.lib.agents.react.agent import ReActAgent
-from llama_stack_client.lib.agents.react.tool_parser import ReActOutput
 
 class AgentRegistry:
-    def __init__(self, client: LlamaStackClient):
+    def __init__(self, client: LlamaStackClient, http_client: httpx.Client = None):
         self.client = client
+        # Pooled client for the REST fallbacks; shares keep-alive connections
+        # with the LlamaStack SDK when the lifespan passes its transport in.
+        self._owns_http = http_client is None
+        self._http = http_client or httpx.Client(timeout=30)
         self.agents = {}
         self.sessions = {}
         self.agent_configs = {}
+        self._existing_by_name = None
+        self._created_agents = {}
+        self._name_locks = {}
+
+    def _list_agents(self) -> list:
+        if hasattr(self.client.agents, "list"):
+            response = self.client.agents.list()
+            return response.data if hasattr(response, 'data') else response
+        response = self._http.get(f"{self.client.base_url}/v1/agents", timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("data", [])
+
+    def prime_existing_agents(self) -> list:
+        """
+        Lists LlamaStack agents once and indexes them by name, so each
+        get_existing_agent_by_name during registration is a dict lookup.
+        """
+        agents_data = self._list_agents()
+        existing_by_name = {}
+        for agent in agents_data:
+            existing_name = agent.get("agent_config", {}).get("name")
+            if existing_name:
+                existing_by_name.setdefault(existing_name, agent.get("agent_id"))
+        self._existing_by_name = existing_by_name
+        return agents_data
 
     def get_existing_agent_by_name(self, agent_name: str) -> str:
         try:
-            if hasattr(self.client.agents, "list"):
-                response = self.client.agents.list()
-                agents_data = response.data if hasattr(response, 'data') else response
-            else:
-                import httpx
-                response = httpx.get(f"{self.client.base_url}/v1/agents", timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                agents_data = data.get("data", [])
-            for agent in agents_data:
-                agent_config = agent.get("agent_config", {})
-                existing_name = agent_config.get("name")
-                if existing_name and existing_name == agent_name:
-                    agent_id = agent.get("agent_id")
-                    logger.info(f"🔍 Found existing agent: {agent_name} with ID: {agent_id}")
-                    return agent_id
+            if self._existing_by_name is None:
+                self.prime_existing_agents()
+            agent_id = self._existing_by_name.get(agent_name)
+            if agent_id:
+                logger.info("🔍 Found existing agent: %s with ID: %s", agent_name, agent_id)
+                return agent_id
         except Exception as e:
-            logger.warning(f"Error checking existing agents: {e}")
-        logger.info(f"🔍 No existing agent found for: {agent_name}")
+            logger.warning("Error checking existing agents: %s", e)
+        logger.info("🔍 No existing agent found for: %s", agent_name)
         return None
 
     async def get_or_create_agent(self, agent_config_dict: dict) -> str:
+        # Registrations may run concurrently; serialize per name so callers
+        # racing on one name reuse the first registration.
+        lock = self._name_locks.setdefault(agent_config_dict["name"], asyncio.Lock())
+        async with lock:
+            return await self._get_or_create_agent(agent_config_dict)
+
+    async def _get_or_create_agent(self, agent_config_dict: dict) -> str:
         agent_name = agent_config_dict["name"]
-        logger.info(f"🔍 Processing agent creation request for: {agent_name}")
+        logger.info("🔍 Processing agent creation request for: %s", agent_name)
         
         # Skip LlamaStack registration for ReAct agents
         if agent_name == "ansible_upgrade_analysis":
-            logger.info(f"⏭️ Skipping LlamaStack registration for ReAct agent: {agent_name}")
-            dummy_id = f"react-{uuid.uuid4()}"
+            logger.info("⏭️ Skipping LlamaStack registration for ReAct agent: %s", agent_name)
+            dummy_id = f"react-{uuid.uuid4().hex}"
             self.agents[agent_name] = dummy_id
             self.agent_configs[agent_name] = agent_config_dict
             return dummy_id
         
-        logger.info(f"🔧 Agent config keys: {list(agent_config_dict.keys())}")
-        logger.info(f"🔧 Tools in config: {agent_config_dict.get('tools', [])}")
-        logger.info(f"🔧 Toolgroups in config: {agent_config_dict.get('toolgroups', [])}")
-        logger.info(f"🔧 Tool config: {agent_config_dict.get('tool_config', {})}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔧 Agent config keys: %s", list(agent_config_dict.keys()))
+            logger.debug("🔧 Tools in config: %s", agent_config_dict.get('tools', []))
+            logger.debug("🔧 Toolgroups in config: %s", agent_config_dict.get('toolgroups', []))
+            logger.debug("🔧 Tool config: %s", agent_config_dict.get('tool_config', {}))
         
-        if not agent_name or agent_name.lower() in ['none', 'null', '']:
+        if not agent_name or agent_name.lower() in RESERVED_AGENT_NAMES:
             raise ValueError(f"Agent name cannot be None/empty: {agent_name}")
         if agent_name in self.agents:
-            logger.info(f"♻️ Reusing locally registered agent: {agent_name}")
+            logger.info("♻️ Reusing locally registered agent: %s", agent_name)
             return self.agents[agent_name]
-        existing_agent_id = self.get_existing_agent_by_name(agent_name)
+        existing_agent_id = await asyncio.to_thread(self.get_existing_agent_by_name, agent_name)
         if existing_agent_id:
             self.agents[agent_name] = existing_agent_id
             self.agent_configs[agent_name] = agent_config_dict
-            logger.info(f"📝 Registered existing LlamaStack agent: {agent_name}")
+            logger.info("📝 Registered existing LlamaStack agent: %s", agent_name)
             return existing_agent_id
         
-        logger.info(f"🆕 Creating new agent: {agent_name}")
+        logger.info("🆕 Creating new agent: %s", agent_name)
         
         tools_to_pass = agent_config_dict.get("tools", [])
         toolgroups_to_pass = agent_config_dict.get("toolgroups", [])
         tool_config_to_pass = agent_config_dict.get("tool_config", {})
         
-        logger.info(f"🔧 Passing to AgentConfig - Tools: {tools_to_pass}")
-        logger.info(f"🔧 Passing to AgentConfig - Toolgroups: {toolgroups_to_pass}")
-        logger.info(f"🔧 Passing to AgentConfig - Tool config: {tool_config_to_pass}")
+        logger.debug("🔧 Passing to AgentConfig - Tools: %s", tools_to_pass)
+        logger.debug("🔧 Passing to AgentConfig - Toolgroups: %s", toolgroups_to_pass)
+        logger.debug("🔧 Passing to AgentConfig - Tool config: %s", tool_config_to_pass)
         
         agent_config = AgentConfig(
             name=agent_name,
@@ -122,61 +161,67 @@ class AgentRegistry:
             enable_session_persistence=True,
         )
         
-        logger.info(f"🔧 AgentConfig created with tools: {getattr(agent_config, 'tools', 'NOT_SET')}")
-        logger.info(f"🔧 AgentConfig created with toolgroups: {getattr(agent_config, 'toolgroups', 'NOT_SET')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔧 AgentConfig created with tools: %s", getattr(agent_config, 'tools', 'NOT_SET'))
+            logger.debug("🔧 AgentConfig created with toolgroups: %s", getattr(agent_config, 'toolgroups', 'NOT_SET'))
         
         try:
-            response = self.client.agents.create(agent_config=agent_config)
+            response = await asyncio.to_thread(self.client.agents.create, agent_config=agent_config)
             agent_id = response.agent_id
-            self._verify_agent_creation(agent_id, agent_name)
+            self._created_agents[agent_name] = agent_id
             self.agents[agent_name] = agent_id
+            if self._existing_by_name is not None:
+                self._existing_by_name[agent_name] = agent_id
             self.agent_configs[agent_name] = agent_config_dict
-            logger.info(f" Created and registered new agent: {agent_name} with ID: {agent_id}")
+            logger.info(" Created and registered new agent: %s with ID: %s", agent_name, agent_id)
             
             try:
-                import httpx
-                verify_response = httpx.get(f"{self.client.base_url}/v1/agents/{agent_id}", timeout=10)
+                verify_response = await asyncio.to_thread(
+                    self._http.get, f"{self.client.base_url}/v1/agents/{agent_id}", timeout=10
+                )
                 if verify_response.status_code == 200:
                     agent_data = verify_response.json()
                     actual_tools = agent_data.get("agent_config", {}).get("client_tools", [])
                     actual_toolgroups = agent_data.get("agent_config", {}).get("toolgroups", [])
-                    logger.info(f" Verified agent {agent_name} - Tools: {actual_tools}")
-                    logger.info(f" Verified agent {agent_name} - Toolgroups: {actual_toolgroups}")
+                    logger.debug(" Verified agent %s - Tools: %s", agent_name, actual_tools)
+                    logger.debug(" Verified agent %s - Toolgroups: %s", agent_name, actual_toolgroups)
                 else:
-                    logger.warning(f"⚠️ Could not verify agent {agent_name} - HTTP {verify_response.status_code}")
+                    logger.warning("⚠️ Could not verify agent %s - HTTP %s", agent_name, verify_response.status_code)
             except Exception as ve:
-                logger.warning(f"⚠️ Could not verify agent {agent_name}: {ve}")
+                logger.warning("⚠️ Could not verify agent %s: %s", agent_name, ve)
             
             return agent_id
         except Exception as e:
-            logger.error(f" Failed to create agent {agent_name}: {e}")
+            logger.error(" Failed to create agent %s: %s", agent_name, e)
             raise
 
-    def _verify_agent_creation(self, agent_id: str, expected_name: str):
+    async def verify_created_agents(self) -> bool:
+        """
+        Checks every agent created during registration against a single
+        agents listing, instead of one listing per created agent.
+        """
+        if not self._created_agents:
+            return True
         try:
-            if hasattr(self.client.agents, "list"):
-                response = self.client.agents.list()
-                agents_data = response.data if hasattr(response, 'data') else response
-            else:
-                import httpx
-                response = httpx.get(f"{self.client.base_url}/v1/agents", timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                agents_data = data.get("data", [])
-            for agent in agents_data:
-                if agent.get("agent_id") == agent_id:
-                    actual_name = agent.get("agent_config", {}).get("name")
-                    if actual_name == expected_name:
-                        logger.info(f" Agent name verified: {expected_name}")
-                        return True
-                    else:
-                        logger.warning(f"⚠️ Agent name mismatch: expected '{expected_name}', got '{actual_name}'")
-                        return False
-            logger.warning(f"⚠️ Could not find created agent {agent_id} in list")
-            return False
+            agents_data = await asyncio.to_thread(self._list_agents)
         except Exception as e:
-            logger.warning(f"⚠️ Could not verify agent creation: {e}")
+            logger.warning("⚠️ Could not verify agent creation: %s", e)
+            return False
+        names_by_id = {
+            agent.get("agent_id"): agent.get("agent_config", {}).get("name")
+            for agent in agents_data
+        }
+        problems = []
+        for expected_name, agent_id in self._created_agents.items():
+            if agent_id not in names_by_id:
+                problems.append(f"{expected_name} ({agent_id}): not found in list")
+            elif names_by_id[agent_id] != expected_name:
+                problems.append(f"{expected_name} ({agent_id}): listed as '{names_by_id[agent_id]}'")
+        if problems:
+            logger.warning("⚠️ Agent verification issues: %s", '; '.join(problems))
             return False
+        logger.info(" Agent names verified: %s", list(self._created_agents))
+        return True
 
     def create_session(self, agent_name: str) -> str:
         if agent_name not in self.agents:
@@ -185,25 +230,25 @@ class AgentRegistry:
         
         # Skip session creation for ReAct agents
         if agent_name == "ansible_upgrade_analysis":
-            dummy_session = f"react-session-{uuid.uuid4()}"
+            dummy_session = f"react-session-{uuid.uuid4().hex}"
             self.sessions[agent_name] = dummy_session
-            logger.info(f"📱 Created dummy session {dummy_session} for ReAct agent: {agent_name}")
+            logger.info("📱 Created dummy session %s for ReAct agent: %s", dummy_session, agent_name)
             return dummy_session
         
         if agent_name in self.sessions:
-            logger.info(f"♻️ Reusing existing session for agent: {agent_name}")
+            logger.info("♻️ Reusing existing session for agent: %s", agent_name)
             return self.sessions[agent_name]
         try:
             response = self.client.agents.session.create(
                 agent_id=agent_id,
-                session_name=f"Session-{agent_name}-{uuid.uuid4()}",
+                session_name=f"Session-{agent_name}-{secrets.token_hex(8)}",
             )
             session_id = response.session_id
             self.sessions[agent_name] = session_id
-            logger.info(f"📱 Created session {session_id} for agent: {agent_name}")
+            logger.info("📱 Created session %s for agent: %s", session_id, agent_name)
             return session_id
         except Exception as e:
-            logger.error(f" Failed to create session for agent {agent_name}: {e}")
+            logger.error(" Failed to create session for agent %s: %s", agent_name, e)
             raise
 
     def get_agent_id(self, agent_name: str) -> str:
@@ -216,10 +261,21 @@ class AgentRegistry:
             return self.create_session(agent_name)
         return self.sessions[agent_name]
 
-    def get_status(self) -> dict:
+    def close(self):
+        """Closes the REST client if the registry created it itself."""
+        if self._owns_http:
+            self._http.close()
+
+    def get_summary(self) -> dict:
+        """Counts only; cheap enough for the liveness-probed root endpoint."""
         return {
             "registered_agents": len(self.agents),
             "active_sessions": len(self.sessions),
+        }
+
+    def get_status(self) -> dict:
+        return {
+            **self.get_summary(),
             "agents": dict(self.agents),
             "sessions": dict(self.sessions)
         }
@@ -229,308 +285,345 @@ def extract_vector_db_id(agent_config: dict, default: str = "iac") -> str:
     Extract vector DB ID from agent config, supporting both tools and toolgroups.
     Falls back to default if not found.
     """
-    # Try tools first (legacy format)
-    tools = agent_config.get("tools", [])
-    for tool in tools:
-        if isinstance(tool, dict):
-            tool_name = tool.get("name", "")
-            if "rag" in tool_name:
-                args = tool.get("args", {})
-                vector_db_ids = args.get("vector_db_ids", [])
-                if vector_db_ids:
-                    return vector_db_ids[0]
-    
-    # For toolgroups (new format), use default since toolgroups handle config internally
-    toolgroups = agent_config.get("toolgroups", [])
-    for toolgroup in toolgroups:
-        if "rag" in toolgroup:
-            # Toolgroups don't expose vector_db_ids in config, use default
-            return default
-    
-    # Fallback to default
+    # Tools (legacy format) can carry explicit vector_db_ids; first RAG tool with ids wins
+    for tool in agent_config.get("tools", ()):
+        if isinstance(tool, dict) and "rag" in tool.get("name", ""):
+            vector_db_ids = tool.get("args", {}).get("vector_db_ids")
+            if vector_db_ids:
+                return vector_db_ids[0]
+
+    # Toolgroups (new format) don't expose vector_db_ids in config, so a RAG
+    # toolgroup and no RAG config at all both resolve to the default.
     return default
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class FileStorageConfig(BaseModel):
+    upload_dir: str = "./uploads"
+
+class VectorDBConfig(BaseModel):
+    default_db_id: Optional[str] = None
+    default_chunk_size: int = 512
+
+class StartupConfig(BaseModel):
+    """The config.yaml sections lifespan reads, validated once up front."""
+    prompts: Dict[str, str] = {}
+    agent_instructions: Dict[str, str] = {}
+    file_storage: FileStorageConfig = FileStorageConfig()
+    vector_db: VectorDBConfig = VectorDBConfig()
+
+class WiringContext(NamedTuple):
+    """What the wiring functions below need besides the agent's registration info."""
+    client: LlamaStackClient
+    config_loader: Any
+    startup_cfg: StartupConfig
+
+def _require_prompt_and_instructions(ctx: WiringContext, wrapper: str, prompt_key: str, instructions_key: str):
+    prompt = ctx.startup_cfg.prompts.get(prompt_key)
+    instructions = ctx.startup_cfg.agent_instructions.get(instructions_key)
+    if not prompt or not instructions:
+        logger.error(" %s requires both prompt template and instructions in config.yaml!", wrapper)
+        raise RuntimeError(f"{wrapper} requires both prompt template and instructions in config.yaml!")
+    return prompt, instructions
+
+def _wire_chef(app: FastAPI, info: dict, ctx: WiringContext) -> str:
+    prompt, instructions = _require_prompt_and_instructions(
+        ctx, "ChefAnalysisAgent", "chef_analysis_enhanced", "chef_analysis"
+    )
+    app.state.chef_analysis_agent = ChefAnalysisAgent(
+        client=ctx.client,
+        agent_id=info["agent_id"],
+        session_id=info["session_id"],
+        instruction=instructions,
+        enhanced_prompt_template=prompt,
+    )
+    return "ChefAnalysisAgent"
+
+def _wire_bladelogic(app: FastAPI, info: dict, ctx: WiringContext) -> str:
+    app.state.bladelogic_analysis_agent = BladeLogicAnalysisAgent(
+        client=ctx.client,
+        agent_id=info["agent_id"],
+        session_id=info["session_id"]
+    )
+    return "BladeLogicAnalysisAgent"
+
+def _wire_shell(app: FastAPI, info: dict, ctx: WiringContext) -> str:
+    app.state.shell_analysis_agent = ShellAnalysisAgent(
+        client=ctx.client,
+        agent_id=info["agent_id"],
+        session_id=info["session_id"],
+        config_loader=ctx.config_loader
+    )
+    return "ShellAnalysisAgent"
+
+def _wire_salt(app: FastAPI, info: dict, ctx: WiringContext) -> str:
+    app.state.salt_analysis_agent = SaltAnalysisAgent(
+        client=ctx.client,
+        agent_id=info["agent_id"],
+        session_id=info["session_id"],
+        config_loader=ctx.config_loader
+    )
+    return "SaltAnalysisAgent"
+
+def _wire_context(app: FastAPI, info: dict, ctx: WiringContext) -> str:
+    context_config = info["config"]
+    # Extract vector DB ID with support for both tools and toolgroups
+    vector_db_id = extract_vector_db_id(context_config, default="iac")
+    logger.debug("🔍 Context agent toolgroups: %s", context_config.get('toolgroups', []))
+    logger.debug("🔍 Context agent tools: %s", context_config.get('tools', []))
+    app.state.context_agent = ContextAgent(
+        client=ctx.client,
+        agent_id=info["agent_id"],
+        session_id=info["session_id"],
+        vector_db_id=vector_db_id
+    )
+    return "ContextAgent"
+
+def _wire_codegen(app: FastAPI, info: dict, ctx: WiringContext) -> str:
+    _require_prompt_and_instructions(ctx, "CodeGeneratorAgent", "generate", "generate")
+    app.state.codegen_agent = CodeGeneratorAgent(
+        client=ctx.client,
+        agent_id=info["agent_id"],
+        session_id=info["session_id"],
+        config_loader=ctx.config_loader
+    )
+    return "CodeGeneratorAgent"
+
+def _wire_validation(app: FastAPI, info: dict, ctx: WiringContext) -> str:
+    validation_prompt = ctx.startup_cfg.prompts.get("validate")
+    validation_instructions = ctx.startup_cfg.agent_instructions.get("validate")
+    if not validation_prompt:
+        logger.error(" ValidationAgent missing 'prompts.validate' in config.yaml!")
+        raise RuntimeError("ValidationAgent requires 'prompts.validate' template in config.yaml!")
+    if not validation_instructions:
+        logger.error(" ValidationAgent missing 'agent_instructions.validate' in config.yaml!")
+        raise RuntimeError("ValidationAgent requires 'agent_instructions.validate' in config.yaml!")
+
+    toolgroups = info.get("config", {}).get("toolgroups", [])
+    if "mcp::ansible_lint" not in toolgroups:
+        logger.warning("⚠️ ValidationAgent missing 'mcp::ansible_lint' toolgroup - tool calling may not work!")
+    logger.debug("🔧 ValidationAgent toolgroups: %s", toolgroups)
+
+    try:
+        app.state.validation_agent = ValidationAgent(
+            client=ctx.client,
+            agent_id=info["agent_id"],
+            session_id=info["session_id"],
+            prompt_template=validation_prompt,
+            instruction=validation_instructions,
+            verbose_logging=True,
+            timeout=120
+        )
+    except Exception as e:
+        logger.error(" Failed to initialize ValidationAgent: %s", e)
+        raise RuntimeError(f"ValidationAgent initialization failed: {e}")
+    return "ValidationAgent"
+
+def _wire_ansible_upgrade(app: FastAPI, info: dict, ctx: WiringContext) -> Optional[str]:
+    # ReAct style; optional, so a failure here does not stop startup
+    try:
+        app.state.ansible_upgrade_agent = AnsibleUpgradeAnalysisAgent(
+            client=ctx.client,
+            config_loader=ctx.config_loader,
+            agent_name="ansible_upgrade_analysis"
+        )
+    except Exception as e:
+        logger.error(" Failed to initialize AnsibleUpgradeAnalysisAgent: %s", e)
+        logger.warning("⚠️ Continuing without Ansible Upgrade Analysis agent")
+        return None
+    return "AnsibleUpgradeAnalysisAgent"
+
+# (registered names, first match wins; wiring function; startup error if absent, else just warn)
+AGENT_WIRING = (
+    (("chef_analysis", "chef_analysis_chaining"), _wire_chef, None),
+    (("bladelogic_analysis",), _wire_bladelogic, None),
+    (("shell_analysis",), _wire_shell, None),
+    (("salt_analysis",), _wire_salt, None),
+    (("context",), _wire_context, None),
+    (("generate",), _wire_codegen, None),
+    (("validate",), _wire_validation, "ValidationAgent configuration missing from config.yaml!"),
+    (("ansible_upgrade_analysis",), _wire_ansible_upgrade, None),
+)
+
 agent_registry = None
 
+@contextmanager
+def _queued_root_logging():
+    """Hand log records to a background listener so handler I/O stays off the request path.
+
+    The root handlers are put back on exit, so nothing is left queued with no
+    listener after shutdown or between lifespans in the same process.
+    """
+    root_handlers = logging.root.handlers[:]
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, *root_handlers, respect_handler_level=True
+    )
+    logging.root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        logging.root.handlers = root_handlers
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    with _queued_root_logging():
+        async with _serve(app):
+            yield
+
+@asynccontextmanager
+async def _serve(app: FastAPI):
     global agent_registry
     logger.info("🚀 Starting X2A Agents API ...")
 
-    client = LlamaStackClient(base_url=llamastack_base_url)
-    agent_registry = AgentRegistry(client)
-    app.state.client = client
-    app.state.agent_registry = agent_registry
-    app.state.config_loader = config_loader
-
-    logger.info(f"🔗 Connected to LlamaStack: {llamastack_base_url}")
-    
-    logger.info("🤖 Loading agent configurations...")
-    agents_config = config_loader.get_agents_config()
-    logger.info(f"📊 Total agents found in config.yaml: {len(agents_config)}")
-    
-    for i, agent_config in enumerate(agents_config):
-        agent_name = agent_config.get("name", "UNNAMED")
-        logger.info(f"📝 Agent {i+1}/{len(agents_config)}: {agent_name}")
-    
-    logger.info("🤖 Starting agent registration...")
-
-    # Verify LlamaStack before registration
-    logger.info("🔍 Checking existing agents in LlamaStack...")
+    # One pooled transport shared by every agent's LlamaStack calls
+    http_client = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
+    agent_registry = None
+    # Startup can fail partway (registration, wiring, config validation);
+    # whatever was opened is closed in the finally either way.
     try:
-        if hasattr(client.agents, "list"):
-            response = client.agents.list()
-            agents_data = response.data if hasattr(response, 'data') else response
-        else:
-            import httpx
-            response = httpx.get(f"{client.base_url}/v1/agents", timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            agents_data = data.get("data", [])
+        client = LlamaStackClient(base_url=llamastack_base_url, http_client=http_client)
+        agent_registry = AgentRegistry(client, http_client)
+        app.state.client = client
+        # Async REST client for routers; use request.app.state.http rather than
+        # opening a new AsyncClient per request
+        app.state.http = httpx.AsyncClient(
+            base_url=llamastack_base_url,
+            timeout=30,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        app.state.agent_registry = agent_registry
+        app.state.config_loader = config_loader
+
+        # A name listed twice registers once; the first entry wins, as in
+        # ConfigLoader.get_agent_config. Registration fans out below, so this keeps
+        # two workers from creating sessions for the same name.
+        unique_agents = {}
+        for agent_config in config_loader.get_agents_config():
+            unique_agents.setdefault(agent_config["name"], agent_config)
+        agents_config = tuple(unique_agents.values())
+        # Collected while starting up and logged once at the end
+        startup_summary = {
+            "llamastack_url": llamastack_base_url,
+            "agents_configured": len(agents_config),
+        }
+        # Sections read by the agent setup blocks below; a malformed section fails here
+        startup_cfg = StartupConfig.model_validate(config_loader.config)
+    
+        # Verify LlamaStack before registration
+        try:
+            # Also primes the registry's name index used by get_or_create_agent
+            agents_data = await asyncio.to_thread(agent_registry.prime_existing_agents)
         
-        logger.info(f"🌐 Existing agents in LlamaStack: {len(agents_data)}")
-        for agent in agents_data:
-            agent_config = agent.get("agent_config", {})
-            agent_name = agent_config.get("name", "UNNAMED")
-            agent_id = agent.get("agent_id", "NO_ID")
-            logger.info(f"   🔸 Existing: {agent_name} (ID: {agent_id[:8]}...)")
-            
-    except Exception as e:
-        logger.warning(f"⚠️ Could not check existing LlamaStack agents: {e}")
+            startup_summary["existing_llamastack_agents"] = len(agents_data)
+            if logger.isEnabledFor(logging.DEBUG):
+                for agent in agents_data:
+                    logger.debug(
+                        "   🔸 Existing: %s (ID: %s...)",
+                        agent.get("agent_config", {}).get("name", "UNNAMED"),
+                        agent.get("agent_id", "NO_ID")[:8],
+                    )
 
-    registered_agents = {}
+        except Exception as e:
+            logger.warning("⚠️ Could not check existing LlamaStack agents: %s", e)
 
-    for i, agent_config in enumerate(agents_config):
-        agent_name = agent_config["name"]
-        logger.info(f"🔧 Setting up agent {i+1}/{len(agents_config)}: {agent_name}...")
-        try:
-            agent_id = await agent_registry.get_or_create_agent(agent_config)
-            session_id = agent_registry.create_session(agent_name)
-            registered_agents[agent_name] = {
+        async def _setup_one(i: int, agent_config: dict) -> dict:
+            agent_name = agent_config["name"]
+            logger.debug("🔧 Setting up agent %d/%d: %s...", i + 1, len(agents_config), agent_name)
+            try:
+                agent_id = await agent_registry.get_or_create_agent(agent_config)
+                session_id = await asyncio.to_thread(agent_registry.create_session, agent_name)
+            except Exception as e:
+                logger.error(" Failed to setup agent %d/%d: %s - %s", i + 1, len(agents_config), agent_name, e)
+                raise
+            logger.debug(" Agent %d/%d ready: %s (ID: %s)", i + 1, len(agents_config), agent_name, agent_id)
+            return {
                 "agent_id": agent_id,
                 "session_id": session_id,
                 "config": agent_config
             }
-            logger.info(f" Agent {i+1}/{len(agents_config)} ready: {agent_name} (ID: {agent_id})")
-        except Exception as e:
-            logger.error(f" Failed to setup agent {i+1}/{len(agents_config)}: {agent_name} - {e}")
-            raise
 
-    logger.info(f"📋 Registration Summary:")
-    logger.info(f"   Agents in config: {len(agents_config)}")
-    logger.info(f"   Agents registered: {len(registered_agents)}")
-    logger.info(f"   Registered agent names: {list(registered_agents.keys())}")
-
-    app.state.registered_agents = registered_agents
-    agent_manager = AgentManager(llamastack_base_url)
-    app.state.agent_manager = agent_manager
-
-    # === Setup ChefAnalysisAgent ===
-    chef_agent_name = None
-    if "chef_analysis" in registered_agents:
-        chef_agent_name = "chef_analysis"
-    elif "chef_analysis_chaining" in registered_agents:
-        chef_agent_name = "chef_analysis_chaining"
-
-    if chef_agent_name:
-        from agents.chef_analysis.agent import ChefAnalysisAgent
-        chef_info = registered_agents[chef_agent_name]
-        chef_prompt_template = config_loader.config.get("prompts", {}).get("chef_analysis_enhanced")
-        chef_instructions = config_loader.config.get("agent_instructions", {}).get("chef_analysis")
-        if not chef_prompt_template or not chef_instructions:
-            logger.error(" ChefAnalysisAgent requires both prompt template and instructions in config.yaml!")
-            raise RuntimeError("ChefAnalysisAgent requires both prompt template and instructions in config.yaml!")
-        chef_agent = ChefAnalysisAgent(
-            client=client,
-            agent_id=chef_info["agent_id"],
-            session_id=chef_info["session_id"],
-            instruction=chef_instructions,
-            enhanced_prompt_template=chef_prompt_template,
-        )
-        app.state.chef_analysis_agent = chef_agent
-        logger.info(f"🍳 ChefAnalysisAgent ready: agent_id={chef_info['agent_id']}")
-    else:
-        logger.warning("⚠️ chef_analysis agent not found in config!")
-
-    # === Setup BladeLogicAnalysisAgent ===
-    if "bladelogic_analysis" in registered_agents:
-        from agents.bladelogic_analysis.agent import BladeLogicAnalysisAgent
-        bladelogic_info = registered_agents["bladelogic_analysis"]
-        bladelogic_agent = BladeLogicAnalysisAgent(
-            client=client,
-            agent_id=bladelogic_info["agent_id"],
-            session_id=bladelogic_info["session_id"]
+        # Agents are independent, so register them concurrently; the LlamaStack
+        # round trips overlap instead of adding up.
+        results = await asyncio.gather(
+            *(_setup_one(i, agent_config) for i, agent_config in enumerate(agents_config)),
+            return_exceptions=True,
         )
-        app.state.bladelogic_analysis_agent = bladelogic_agent
-        logger.info(f"🔧 BladeLogicAnalysisAgent ready: agent_id={bladelogic_info['agent_id']}")
-    else:
-        logger.warning("⚠️ bladelogic_analysis agent not found in config!")
-
-    # === Setup ShellAnalysisAgent ===
-    if "shell_analysis" in registered_agents:
-        from agents.shell_analysis.agent import ShellAnalysisAgent
-        shell_info = registered_agents["shell_analysis"]
-        shell_agent = ShellAnalysisAgent(
-            client=client,
-            agent_id=shell_info["agent_id"],
-            session_id=shell_info["session_id"],
-            config_loader=config_loader
-        )
-        app.state.shell_analysis_agent = shell_agent
-        logger.info(f"🐚 ShellAnalysisAgent ready: agent_id={shell_info['agent_id']}")
-    else:
-        logger.warning("⚠️ shell_analysis agent not found in config!")
-
-    # === Setup SaltAnalysisAgent ===
-    if "salt_analysis" in registered_agents:
-        from agents.salt_analysis.agent import SaltAnalysisAgent
-        salt_info = registered_agents["salt_analysis"]
-        salt_agent = SaltAnalysisAgent(
-            client=client,
-            agent_id=salt_info["agent_id"],
-            session_id=salt_info["session_id"],
-            config_loader=config_loader
-        )
-        app.state.salt_analysis_agent = salt_agent
-        logger.info(f"🧂 SaltAnalysisAgent ready: agent_id={salt_info['agent_id']}")
-    else:
-        logger.warning("⚠️ salt_analysis agent not found in config!")
-
-    # === Setup ContextAgent ===
-    if "context" in registered_agents:
-        context_info = registered_agents["context"]
-        context_config = context_info["config"]
-        
-        # Extract vector DB ID with support for both tools and toolgroups
-        vector_db_id = extract_vector_db_id(context_config, default="iac")
-        
-        logger.info(f"🔍 Context agent using vector DB: {vector_db_id}")
-        logger.info(f"🔍 Context agent toolgroups: {context_config.get('toolgroups', [])}")
-        logger.info(f"🔍 Context agent tools: {context_config.get('tools', [])}")
-        
-        # Use the registered agent with extracted vector DB ID
-        app.state.context_agent = ContextAgent(
-            client=client,
-            agent_id=context_info["agent_id"],
-            session_id=context_info["session_id"],
-            vector_db_id=vector_db_id
-        )
-        logger.info(f"🔍 ContextAgent ready: agent_id={context_info['agent_id']}")
-    else:
-        logger.warning("⚠️ context agent not found in config!")
-
-    # === Setup CodeGeneratorAgent ===
-    if "generate" in registered_agents:
-        codegen_info = registered_agents["generate"]
-        codegen_prompt = config_loader.config.get("prompts", {}).get("generate")
-        codegen_instructions = config_loader.config.get("agent_instructions", {}).get("generate")
-        if not codegen_prompt or not codegen_instructions:
-            logger.error(" CodeGeneratorAgent requires both prompt template and instructions in config.yaml!")
-            raise RuntimeError("CodeGeneratorAgent requires both prompt template and instructions in config.yaml!")
-        app.state.codegen_agent = CodeGeneratorAgent(
-            client=client,
-            agent_id=codegen_info["agent_id"],
-            session_id=codegen_info["session_id"],
-            config_loader=config_loader
-        )
-        logger.info(f"🔧 CodeGeneratorAgent ready: agent_id={codegen_info['agent_id']}")
-    else:
-        logger.warning("⚠️ generate agent not found in config!")
-
-    # === Setup ValidationAgent ===
-    if "validate" in registered_agents:
-        validation_info = registered_agents["validate"]
-        validation_prompt = config_loader.config.get("prompts", {}).get("validate")
-        validation_instructions = config_loader.config.get("agent_instructions", {}).get("validate")
-        
-        if not validation_prompt:
-            logger.error(" ValidationAgent missing 'prompts.validate' in config.yaml!")
-            raise RuntimeError("ValidationAgent requires 'prompts.validate' template in config.yaml!")
-        
-        if not validation_instructions:
-            logger.error(" ValidationAgent missing 'agent_instructions.validate' in config.yaml!")
-            raise RuntimeError("ValidationAgent requires 'agent_instructions.validate' in config.yaml!")
-        
-        agent_config = validation_info.get("config", {})
-        toolgroups = agent_config.get("toolgroups", [])
-        if "mcp::ansible_lint" not in toolgroups:
-            logger.warning("⚠️ ValidationAgent missing 'mcp::ansible_lint' toolgroup - tool calling may not work!")
-        
-        logger.info(f"🔧 ValidationAgent toolgroups: {toolgroups}")
-        
-        try:
-            app.state.validation_agent = ValidationAgent(
-                client=client,
-                agent_id=validation_info["agent_id"],
-                session_id=validation_info["session_id"],
-                prompt_template=validation_prompt,
-                instruction=validation_instructions,
-                verbose_logging=True,
-                timeout=120
-            )
-            logger.info(f"🔍 ValidationAgent ready: agent_id={validation_info['agent_id']}")
-            
-        except Exception as e:
-            logger.error(f" Failed to initialize ValidationAgent: {e}")
-            raise RuntimeError(f"ValidationAgent initialization failed: {e}")
-            
-    else:
-        logger.error(" validate agent not found in config!")
-        raise RuntimeError("ValidationAgent configuration missing from config.yaml!")
-
-    # === Setup AnsibleUpgradeAnalysisAgent (ReAct Style) ===
-    if "ansible_upgrade_analysis" in registered_agents:
+        registered_agents = {}
+        for agent_config, result in zip(agents_config, results):
+            if isinstance(result, BaseException):
+                raise result
+            registered_agents[agent_config["name"]] = result
+        await agent_registry.verify_created_agents()
+
+        startup_summary["registered_agents"] = {
+            name: info["agent_id"] for name, info in registered_agents.items()
+        }
+        startup_summary["agent_wrappers"] = []
+
+        app.state.registered_agents = registered_agents
+        app.state.registered_agent_names = list(registered_agents)
+        agent_manager = AgentManager(llamastack_base_url, http_client=app.state.http)
+        app.state.agent_manager = agent_manager
+
+        # === Wire the per-agent wrappers for every registered agent ===
+        ctx = WiringContext(client=client, config_loader=config_loader, startup_cfg=startup_cfg)
+        for names, wire, missing_error in AGENT_WIRING:
+            agent_name = next((name for name in names if name in registered_agents), None)
+            if agent_name is None:
+                if missing_error:
+                    logger.error(" %s agent not found in config!", names[0])
+                    raise RuntimeError(missing_error)
+                logger.warning("⚠️ %s agent not found in config!", names[0])
+                continue
+            wrapper = wire(app, registered_agents[agent_name], ctx)
+            if wrapper:
+                startup_summary["agent_wrappers"].append(wrapper)
+        if getattr(app.state, "context_agent", None) is not None:
+            startup_summary["context_vector_db"] = app.state.context_agent.vector_db_id
+
+        # --- File upload directory and vector DB setup (sequential) ---
+        # set_vector_db_client only stores the client and defaults and makes no
+        # LlamaStack calls, so there is nothing to overlap with the makedirs.
+        upload_dir = os.path.abspath(os.getenv("UPLOAD_DIR") or startup_cfg.file_storage.upload_dir)
+        await asyncio.to_thread(os.makedirs, upload_dir, exist_ok=True)
+        set_upload_dir(upload_dir)
+        startup_summary["upload_dir"] = upload_dir
+
+        # A vector DB failure must not stop uploads from working
         try:
-            logger.info("🔄 Initializing Ansible Upgrade Analysis ReAct agent...")
-            
-            from agents.ansible_upgrade.agent import AnsibleUpgradeAnalysisAgent
-            
-            upgrade_agent = AnsibleUpgradeAnalysisAgent(
-                client=client,
-                config_loader=config_loader,
-                agent_name="ansible_upgrade_analysis"
+            default_db_id = startup_cfg.vector_db.default_db_id
+            set_vector_db_client(
+                injected_client=client,
+                default_vector_db_id=default_db_id,
+                default_chunk_size=startup_cfg.vector_db.default_chunk_size
             )
-            app.state.ansible_upgrade_agent = upgrade_agent
-            logger.info(f"🔄 AnsibleUpgradeAnalysisAgent ready (ReAct): {upgrade_agent.agent_name}")
-        except Exception as e:
-            logger.error(f" Failed to initialize AnsibleUpgradeAnalysisAgent: {e}")
-            logger.warning("⚠️ Continuing without Ansible Upgrade Analysis agent")
-    else:
-        logger.warning("⚠️ ansible_upgrade_analysis agent not found in config!")
-
-    # --- File upload directory setup ---
-    upload_dir = os.getenv("UPLOAD_DIR")
-    if not upload_dir:
-        try:
-            file_config = config_loader.config.get("file_storage", {})
-            upload_dir = file_config.get("upload_dir", "./uploads")
+            startup_summary["vector_db"] = default_db_id
         except Exception as e:
-            logger.warning(f"Could not read file_storage config: {e}")
-            upload_dir = "./uploads"
-    upload_dir = os.path.abspath(upload_dir)
-    os.makedirs(upload_dir, exist_ok=True)
-    set_upload_dir(upload_dir)
-    logger.info(f"📁 File upload directory: {upload_dir}")
-
-    # --- Vector DB client setup ---
-    try:
-        vector_config = config_loader.config.get("vector_db", {})
-        default_db_id = vector_config.get("default_db_id")
-        default_chunk_size = vector_config.get("default_chunk_size", 512)
-        set_vector_db_client(
-            injected_client=client,
-            default_vector_db_id=default_db_id,
-            default_chunk_size=default_chunk_size
-        )
-        logger.info(f"🗄️ Vector DB ready: {default_db_id}")
-    except Exception as e:
-        logger.warning(f"⚠️ Vector DB setup failed: {e}")
+            logger.warning("⚠️ Vector DB setup failed: %s", e)
 
-    logger.info(" X2A Agents API startup complete")
+        logger.info(" X2A Agents API startup complete: %s", json.dumps(startup_summary))
 
-    yield
+        yield
 
-    logger.info("🛑 Shutting down X2A Agents API")
+        logger.info("🛑 Shutting down X2A Agents API")
+    finally:
+        http = getattr(app.state, "http", None)
+        if http is not None:
+            await http.aclose()
+            app.state.http = None
+        if agent_registry is not None:
+            agent_registry.close()
+        http_client.close()
 
 app = FastAPI(
     title="X2A Agents API",
@@ -547,72 +640,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(admin_router, prefix="/api")
-app.include_router(chef_router, prefix="/api")
-app.include_router(bladelogic_router, prefix="/api")
-app.include_router(shell_router, prefix="/api")
-app.include_router(salt_router, prefix="/api")
-app.include_router(context_router, prefix="/api")
-app.include_router(files_router, prefix="/api")
-app.include_router(generate_router, prefix="/api")
-app.include_router(validate_router, prefix="/api")
-app.include_router(vector_db_router, prefix="/api")
-app.include_router(ansible_upgrade_router, prefix="/api")
+API_PREFIX = "/api"
+API_ROUTERS = (
+    admin_router,
+    chef_router,
+    bladelogic_router,
+    shell_router,
+    salt_router,
+    context_router,
+    files_router,
+    generate_router,
+    validate_router,
+    vector_db_router,
+    ansible_upgrade_router,
+)
+
+for api_router in API_ROUTERS:
+    app.include_router(api_router, prefix=API_PREFIX)
+
+# app.state attribute -> key in the root payload, for the per-agent debug status
+_ROOT_AGENT_STATUS_KEYS = (
+    ("validation_agent", "validation_agent_status"),
+    ("shell_analysis_agent", "shell_agent_status"),
+    ("salt_analysis_agent", "salt_agent_status"),
+    ("context_agent", "context_agent_status"),
+    ("ansible_upgrade_agent", "ansible_upgrade_status"),
+)
 
 @app.get("/")
 async def root():
-    registry_status = agent_registry.get_status() if agent_registry else {}
-    registered_info = getattr(app.state, 'registered_agents', {})
-    
-    # Add validation agent status for debugging
-    validation_status = {}
-    if hasattr(app.state, 'validation_agent'):
-        try:
-            validation_status = app.state.validation_agent.get_status()
-        except Exception as e:
-            validation_status = {"error": str(e)}
-    
-    # Add shell agent status for debugging
-    shell_status = {}
-    if hasattr(app.state, 'shell_analysis_agent'):
-        try:
-            shell_status = app.state.shell_analysis_agent.get_status()
-        except Exception as e:
-            shell_status = {"error": str(e)}
-    
-    # Add salt agent status for debugging
-    salt_status = {}
-    if hasattr(app.state, 'salt_analysis_agent'):
-        try:
-            salt_status = app.state.salt_analysis_agent.get_status()
-        except Exception as e:
-            salt_status = {"error": str(e)}
-    
-    # Add context agent status for debugging
-    context_status = {}
-    if hasattr(app.state, 'context_agent'):
-        try:
-            context_status = app.state.context_agent.get_status()
-        except Exception as e:
-            context_status = {"error": str(e)}
-    
-    # Add ansible upgrade agent status (ReAct)
-    ansible_upgrade_status = {}
-    if hasattr(app.state, 'ansible_upgrade_agent'):
-        try:
-            ansible_upgrade_status = app.state.ansible_upgrade_agent.get_status()
-        except Exception as e:
-            ansible_upgrade_status = {"error": str(e)}
-    
-    return {
+    registry_status = agent_registry.get_summary() if agent_registry else {}
+
+    payload = {
         "status": "ok",
         "message": " Welcome to X2A multi-agent API with Ansible Upgrade Analysis (ReAct)",
-        "agents": list(registered_info.keys()),
+        "agents": getattr(app.state, 'registered_agent_names', []),
         "registry_status": registry_status,
         "agent_pattern": "Mixed: LlamaStack + ReAct (Ansible Upgrade)",
-        "validation_agent_status": validation_status,
-        "shell_agent_status": shell_status,
-        "salt_agent_status": salt_status,
-        "context_agent_status": context_status,
-        "ansible_upgrade_status": ansible_upgrade_status,
-    }
\ No newline at end of file
+    }
+    # Add agent status for debugging
+    for attr, key in _ROOT_AGENT_STATUS_KEYS:
+        agent = getattr(app.state, attr, None)
+        status = {}
+        if agent is not None:
+            try:
+                status = agent.get_status()
+            except Exception as e:
+                status = {"error": str(e)}
+        payload[key] = status
+    return payload
+
+@app.get("/status/full")
+async def status_full():
+    """Full registry view with agent and session ids (not meant for probes)."""
+    return agent_registry.get_status() if agent_registry else {}
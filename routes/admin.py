@@ -121,22 +121,25 @@ async def refresh_agents(app_request: Request):
         raise HTTPException(status_code=500, detail=f"Failed to refresh agents: {str(e)}")
 
 # ---- System Health & Info ----
+# Static payload, built once at import instead of on every probe
+_ADMIN_HEALTH = {
+    "status": "healthy",
+    "service": "X2A Agents API Admin",
+    "endpoints": [
+        "GET /admin/agents",
+        "POST /admin/agents",
+        "GET /admin/agents/{name}",
+        "DELETE /admin/agents/{name}",
+        "POST /admin/agents/refresh"
+    ]
+}
+
 @router.get("/health")
 async def admin_health():
     """
     Admin health check endpoint.
     """
-    return {
-        "status": "healthy",
-        "service": "X2A Agents API Admin",
-        "endpoints": [
-            "GET /admin/agents",
-            "POST /admin/agents", 
-            "GET /admin/agents/{name}",
-            "DELETE /admin/agents/{name}",
-            "POST /admin/agents/refresh"
-        ]
-    }
+    return _ADMIN_HEALTH
 
 @router.get("/info")
 async def system_info(app_request: Request):
@@ -173,8 +176,8 @@ async def get_agent_instructions(agent_name: str, app_request: Request):
         if hasattr(app_request.app.state, 'config_loader'):
             config_loader = app_request.app.state.config_loader
         else:
-            from config.config import ConfigLoader
-            config_loader = ConfigLoader("config.yaml")
+            from config.config import get_config_loader
+            config_loader = get_config_loader("config.yaml")
         agent_config = config_loader.get_agent_config(agent_name)
         if not agent_config:
             raise HTTPException(status_code=404, detail=f"Agent '{agent_name}' not found")
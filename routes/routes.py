@@ -5,7 +5,7 @@ from pydantic import BaseModel
 from typing import Dict, Any
 
 from agents.chef_analysis.agent import create_chef_analysis_agent, ChefAnalysisAgent
-from config.config import ConfigLoader
+from config.config import get_config_loader
 
 import asyncio
 import json
@@ -15,7 +15,7 @@ import traceback
 router = APIRouter(prefix="/chef", tags=["chef-analysis"])
 
 # ---- Global Config Loader ----
-config_loader = ConfigLoader("config.yaml")
+config_loader = get_config_loader("config.yaml")
 
 def get_chef_agent() -> ChefAnalysisAgent:
     # For production: use a singleton/lru_cache if agent creation is heavy
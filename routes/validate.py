@@ -12,6 +12,10 @@ from agents.validate.validate_agent import ValidationAgent
 router = APIRouter(prefix="/validate", tags=["validation"])
 logger = logging.getLogger("validation_routes")
 
+def utf8_size(text: str) -> int:
+    """Encoded size of text in bytes; skips the encode for pure-ASCII input."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
 def get_validation_agent(request: Request) -> ValidationAgent:
     """Get ValidationAgent from app state (Registry pattern)"""
     if not hasattr(request.app.state, 'validation_agent'):
@@ -74,10 +78,11 @@ async def validate_playbook(
     try:
         # Validate playbook size
         max_size = 50000  # 50KB limit
-        if len(request.playbook_content) > max_size:
+        playbook_size = utf8_size(request.playbook_content)
+        if playbook_size > max_size:
             raise HTTPException(
                 status_code=413,
-                detail=f"Playbook too large ({len(request.playbook_content)} chars). Maximum size: {max_size} characters"
+                detail=f"Playbook too large ({playbook_size} bytes). Maximum size: {max_size} bytes"
             )
         
         # Validate profile
@@ -139,9 +144,10 @@ async def validate_playbook_stream(
     try:
         # Validate playbook size
         max_size = 50000  # 50KB limit
-        if len(request.playbook_content) > max_size:
+        playbook_size = utf8_size(request.playbook_content)
+        if playbook_size > max_size:
             async def size_error_generator():
-                yield f"data: {json.dumps({'type': 'error', 'error': f'Playbook too large ({len(request.playbook_content)} chars). Maximum: {max_size} characters'})}\n\n"
+                yield f"data: {json.dumps({'type': 'error', 'error': f'Playbook too large ({playbook_size} bytes). Maximum: {max_size} bytes'})}\n\n"
             return StreamingResponse(
                 size_error_generator(),
                 media_type="text/event-stream",
@@ -191,8 +197,7 @@ async def validate_playbook_stream(
                 if current_time - start_time > timeout_seconds:
                     yield f"data: {json.dumps({'type': 'error', 'error': 'Streaming validation timed out after 2.5 minutes'})}\n\n"
                     break
-                
-                await asyncio.sleep(0.1)
+
                 yield f"data: {json.dumps(event)}\n\n"
                 
         except Exception as e:
@@ -218,12 +223,12 @@ async def validate_multiple_playbooks(
             raise HTTPException(status_code=400, detail="No files provided")
         
         # Check total size of all files
-        total_size = sum(len(content) for content in request.files.values())
+        total_size = sum(utf8_size(content) for content in request.files.values())
         max_total_size = 100000  # 100KB total limit for multiple files
         if total_size > max_total_size:
             raise HTTPException(
                 status_code=413,
-                detail=f"Total files too large ({total_size} chars). Maximum total size: {max_total_size} characters"
+                detail=f"Total files too large ({total_size} bytes). Maximum total size: {max_total_size} bytes"
             )
         
         # Validate profile
@@ -286,10 +291,11 @@ async def validate_syntax(
     try:
         # Validate playbook size
         max_size = 25000  # Smaller limit for syntax check
-        if len(request.playbook_content) > max_size:
+        playbook_size = utf8_size(request.playbook_content)
+        if playbook_size > max_size:
             raise HTTPException(
                 status_code=413,
-                detail=f"Playbook too large for syntax check ({len(request.playbook_content)} chars). Maximum: {max_size} characters"
+                detail=f"Playbook too large for syntax check ({playbook_size} bytes). Maximum: {max_size} bytes"
             )
         
         # Add timeout for syntax validation
@@ -333,10 +339,11 @@ async def production_validate(
     try:
         # Validate playbook size (stricter for production)
         max_size = 30000  # Smaller limit for production validation
-        if len(request.playbook_content) > max_size:
+        playbook_size = utf8_size(request.playbook_content)
+        if playbook_size > max_size:
             raise HTTPException(
                 status_code=413,
-                detail=f"Playbook too large for production validation ({len(request.playbook_content)} chars). Maximum: {max_size} characters"
+                detail=f"Playbook too large for production validation ({playbook_size} bytes). Maximum: {max_size} bytes"
             )
         
         # Add timeout for production validation
@@ -144,8 +144,8 @@ def get_llamastack_url_from_config():
         import os
         sys.path.append(os.path.dirname(os.path.dirname(__file__)))
         
-        from config.config_loader import ConfigLoader
-        config_loader = ConfigLoader()
+        from config.config import get_config_loader
+        config_loader = get_config_loader("config.yaml")
         base_url = config_loader.get_llamastack_base_url()
         if base_url:
             return base_url.rstrip('/')
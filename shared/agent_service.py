@@ -1,42 +1,47 @@
 import httpx
-import yaml
 import logging
+from functools import reduce
+
+from config.config import load_yaml_cached
 
 logger = logging.getLogger("agent_service")
 logging.basicConfig(level=logging.INFO)
 
+def _overlay(defaults, profile):
+    """Merges profile over defaults; falsy profile values fall back to defaults."""
+    merged = dict(defaults)
+    for key, value in profile.items():
+        base = merged.get(key)
+        if isinstance(value, dict) and isinstance(base, dict):
+            merged[key] = _overlay(base, value)
+        elif value or key not in merged:
+            merged[key] = value
+    return merged
+
 class AgentConfigLoader:
     def __init__(self, config_path="config.yaml"):
-        with open(config_path) as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_yaml_cached(config_path)
         self.profile = self.config.get("active_profile", "local")
         self.defaults = self.config.get("defaults", {})
         self.profile_cfg = self.config.get("profiles", {}).get(self.profile, {})
         self.agent_instructions = self.config.get("agent_instructions", {})
+        # Active profile overlaid on defaults once, so lookups are a single walk
+        self._merged = _overlay(self.defaults, self.profile_cfg)
+
+    def get_value(self, *keys):
+        return reduce(lambda d, k: d.get(k) if isinstance(d, dict) else None, keys, self._merged)
 
     def get_llamastack_base_url(self):
-        return (
-            self.profile_cfg.get("llama_stack", {}).get("base_url")
-            or self.defaults.get("llama_stack", {}).get("base_url")
-        )
+        return self.get_value("llama_stack", "base_url")
 
     def get_llamastack_model(self):
-        return (
-            self.profile_cfg.get("llama_stack", {}).get("model")
-            or self.defaults.get("llama_stack", {}).get("model")
-        )
+        return self.get_value("llama_stack", "model")
 
     def get_agent_timeout(self, agent_name):
-        return (
-            self.profile_cfg.get("agents", {}).get(agent_name, {}).get("timeout")
-            or self.defaults.get("agents", {}).get(agent_name, {}).get("timeout")
-        )
+        return self.get_value("agents", agent_name, "timeout")
 
     def get_agent_max_tokens(self, agent_name):
-        return (
-            self.profile_cfg.get("agents", {}).get(agent_name, {}).get("max_tokens")
-            or self.defaults.get("agents", {}).get(agent_name, {}).get("max_tokens")
-        )
+        return self.get_value("agents", agent_name, "max_tokens")
 
     def get_agent_instructions(self, agent_name):
         return self.agent_instructions.get(agent_name, "")
@@ -10,10 +10,8 @@ from typing import List, Any, Dict, Optional
 from datetime import datetime
 
 try:
-    from rich.pretty import pprint
     from rich.console import Console
     from rich.logging import RichHandler
-    from termcolor import cprint
     RICH_AVAILABLE = True
 except ImportError:
     RICH_AVAILABLE = False
@@ -24,6 +22,8 @@ try:
 except ImportError:
     LLAMASTACK_LOGGER_AVAILABLE = False
 
+_step_logger = logging.getLogger(__name__)
+
 
 class ChefAnalysisLogger:
     """
@@ -194,86 +194,61 @@ class ChefAnalysisLogger:
 
 def step_printer(steps: List[Any], logger: Optional[ChefAnalysisLogger] = None):
     """
-    Print the steps of an agent's response in a formatted way.
+    Log the steps of an agent's response in a formatted way.
     Enhanced version with Chef Analysis specific logging.
-    
+
+    Everything goes through logging at DEBUG level, so nothing is formatted
+    or written unless DEBUG is enabled for the target logger.
+
     Args:
         steps: List of steps from an agent's response
         logger: Optional ChefAnalysisLogger instance
     """
+    target = logger.logger if logger else _step_logger
+    if not target.isEnabledFor(logging.DEBUG):
+        return
+    emit = logger.debug if logger else _step_logger.debug
+
     if not steps:
-        if logger:
-            logger.warning("No steps to print")
+        emit("No steps to print")
         return
-    
-    print_func = logger.info if logger else print
-    
-    if logger:
-        logger.info(f"🔄 Processing {len(steps)} agent steps")
-    
+
+    emit(f"🔄 Processing {len(steps)} agent steps")
+
     for i, step in enumerate(steps):
         step_type = type(step).__name__
-        
-        if RICH_AVAILABLE and logger and logger.console:
-            logger.console.print(f"\n[bold blue]{'─' * 10} 📍 Step {i+1}: {step_type} {'─' * 10}[/]")
-        else:
-            print(f"\n{'-' * 10} 📍 Step {i+1}: {step_type} {'-' * 10}")
-        
+        emit(f"{'-' * 10} 📍 Step {i+1}: {step_type} {'-' * 10}")
+
         if step_type == "ToolExecutionStep":
-            if logger:
-                logger.info("🔧 Executing tool...")
-            else:
-                print("🔧 Executing tool...")
-            
+            tool_response = None
             try:
                 tool_response = step.tool_responses[0].content
-                if RICH_AVAILABLE:
-                    pprint(json.loads(tool_response))
-                else:
-                    print(json.dumps(json.loads(tool_response), indent=2))
-            except (TypeError, JSONDecodeError, AttributeError):
+                tool_response = json.dumps(json.loads(tool_response), indent=2)
+            except (TypeError, JSONDecodeError, AttributeError, IndexError):
                 # Tool response is not a valid JSON object
-                if RICH_AVAILABLE:
-                    pprint(tool_response)
-                else:
-                    print(tool_response)
+                pass
+            emit(f"🔧 Executing tool...\n{tool_response}")
         else:
             # Handle model response steps
-            if hasattr(step, 'api_model_response'):
-                if step.api_model_response.content:
-                    if logger:
-                        logger.info("🤖 Model Response:")
-                    else:
-                        print("🤖 Model Response:")
-                    
-                    if RICH_AVAILABLE:
-                        cprint(f"{step.api_model_response.content}\n", "magenta")
-                    else:
-                        print(f"{step.api_model_response.content}\n")
-                
-                elif hasattr(step.api_model_response, 'tool_calls') and step.api_model_response.tool_calls:
-                    tool_call = step.api_model_response.tool_calls[0]
-                    
-                    if logger:
-                        logger.info("🛠️ Tool call generated:")
-                    else:
-                        print("🛠️ Tool call Generated:")
-                    
+            api_response = getattr(step, 'api_model_response', None)
+            if api_response is not None:
+                if api_response.content:
+                    emit(f"🤖 Model Response:\n{api_response.content}")
+                else:
                     try:
-                        args = json.loads(tool_call.arguments_json)
-                        tool_info = f"Tool call: {tool_call.tool_name}, Arguments: {args}"
-                    except (JSONDecodeError, AttributeError):
-                        tool_info = f"Tool call: {getattr(tool_call, 'tool_name', 'unknown')}"
-                    
-                    if RICH_AVAILABLE:
-                        cprint(tool_info, "magenta")
-                    else:
-                        print(tool_info)
-    
-    if RICH_AVAILABLE and logger and logger.console:
-        logger.console.print(f"\n[bold green]{'=' * 10} Query processing completed {'=' * 10}[/]\n")
-    else:
-        print(f"\n{'=' * 10} Query processing completed {'=' * 10}\n")
+                        tool_call = api_response.tool_calls[0]
+                    except (AttributeError, IndexError, TypeError):
+                        tool_call = None
+
+                    if tool_call is not None:
+                        try:
+                            args = json.loads(tool_call.arguments_json)
+                            tool_info = f"Tool call: {tool_call.tool_name}, Arguments: {args}"
+                        except (JSONDecodeError, AttributeError):
+                            tool_info = f"Tool call: {getattr(tool_call, 'tool_name', 'unknown')}"
+                        emit(f"🛠️ Tool call generated: {tool_info}")
+
+    emit(f"{'=' * 10} Query processing completed {'=' * 10}")
 
 
 def create_chef_logger(correlation_id: str) -> ChefAnalysisLogger:
@@ -12,6 +12,11 @@ import yaml
 import re
 from typing import Dict, Any, List, Optional
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger("TreeSitterAnalyzer")
 logger.setLevel(logging.INFO)
 
@@ -30,8 +35,8 @@ class TreeSitterAnalyzer:
         cfg = {'enabled': True, 'supported_languages': ['ruby', 'yaml']}
         if config_path and os.path.exists(config_path):
             try:
-                with open(config_path) as f:
-                    user_cfg = yaml.safe_load(f)
+                with open(config_path, "rb") as f:
+                    user_cfg = yaml.load(f, Loader=_YamlLoader)
                     cfg.update(user_cfg)
             except Exception as e:
                 logger.warning(f"Config load failed: {e}")
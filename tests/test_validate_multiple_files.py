@@ -0,0 +1,38 @@
+"""
+Unit test for ValidationAgent.validate_multiple_files result ordering.
+Run with: python -m pytest tests/test_validate_multiple_files.py
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+pytest.importorskip("llama_stack_client")
+
+from agents.validate.validate_agent import ValidationAgent
+
+
+def _bare_agent(delays):
+    """A ValidationAgent with validate_playbook replaced by a timed fake."""
+    agent = ValidationAgent.__new__(ValidationAgent)
+    agent._concurrency = asyncio.Semaphore(len(delays))
+    agent.logger = logging.getLogger("ValidationAgent")
+
+    async def fake_validate_playbook(content, profile="basic", correlation_id=None, on_event=None):
+        await asyncio.sleep(delays[content])
+        return {"success": True, "content": content}
+
+    agent.validate_playbook = fake_validate_playbook
+    return agent
+
+
+def test_validate_multiple_files_keeps_caller_order():
+    # Earlier files take longer, so they finish last
+    files = {"a.yml": "a", "b.yml": "b", "c.yml": "c"}
+    agent = _bare_agent({"a": 0.03, "b": 0.02, "c": 0.0})
+
+    results = asyncio.run(agent.validate_multiple_files(files))
+
+    assert list(results) == list(files)
+    assert [r["filename"] for r in results.values()] == list(files)
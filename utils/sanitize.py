@@ -62,7 +62,8 @@ def sanitize_yaml(yaml_text, auto_add_handlers=True, dedupe_tasks=False):
 
             if "vars" in play:
                 for var, val in play.pop("vars", {}).items():
-                    if "vault_lookup" in str(val) or "data_bag" in str(val):
+                    val_str = str(val)
+                    if "vault_lookup" in val_str or "data_bag" in val_str:
                         new_tasks.append({
                             "name": f"Set {var} from env",
                             "set_fact": {
@@ -1,32 +1,39 @@
 import json
+import logging
 from json import JSONDecodeError
 
-from rich.pretty import pprint
-from termcolor import cprint
+logger = logging.getLogger(__name__)
 
-def step_printer(steps):
+def step_printer(steps, correlation_id=None):
     """
-    Print the steps of an agent's response in a formatted way.
+    Log the steps of an agent's response in a formatted way.
     Note: stream need to be set to False to use this function.
+    Records go through logging (INFO), so they are written off the request path.
     Args:
     steps: List of steps from an agent's response.
+    correlation_id: Optional request correlation ID prefixed to every line.
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    tag = f"[{correlation_id}] " if correlation_id else ""
     for i, step in enumerate(steps):
         step_type = type(step).__name__
-        print("\n"+"-" * 10, f"📍 Step {i+1}: {step_type}","-" * 10)
+        logger.info("%s---------- 📍 Step %d: %s ----------", tag, i + 1, step_type)
         if step_type == "ToolExecutionStep":
-            print("🔧 Executing tool...")
+            content = step.tool_responses[0].content
             try:
-                pprint(json.loads(step.tool_responses[0].content))
+                content = json.dumps(json.loads(content), indent=2)
             except (TypeError, JSONDecodeError):
                 # tool response is not a valid JSON object
-                pprint(step.tool_responses[0].content)
+                pass
+            logger.info("%s🔧 Executing tool...\n%s", tag, content)
         else:
             if step.api_model_response.content:
-                print("🤖 Model Response:")
-                cprint(f"{step.api_model_response.content}\n", "magenta")
+                logger.info("%s🤖 Model Response:\n%s", tag, step.api_model_response.content)
             elif step.api_model_response.tool_calls:
                 tool_call = step.api_model_response.tool_calls[0]
-                print("🛠️ Tool call Generated:")
-                cprint(f"Tool call: {tool_call.tool_name}, Arguments: {json.loads(tool_call.arguments_json)}", "magenta")
-    print("="*10, "Query processing completed","="*10,"\n")
\ No newline at end of file
+                logger.info(
+                    "%s🛠️ Tool call Generated: %s, Arguments: %s",
+                    tag, tool_call.tool_name, tool_call.arguments_json,
+                )
+    logger.info("%s========== Query processing completed ==========", tag)
@@ -5,6 +5,11 @@ import logging
 from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 class ConfigValidationError(Exception):
@@ -41,8 +46,8 @@ class ConfigLoader:
             
             # Load YAML content
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as file:
-                    self.config = yaml.safe_load(file)
+                with open(self.config_file, 'rb') as file:
+                    self.config = yaml.load(file, Loader=_YamlLoader)
             except yaml.YAMLError as e:
                 raise ConfigValidationError(
                     f"Invalid YAML syntax in {self.config_file}:\n{str(e)}\n"
@@ -232,6 +232,18 @@ async def configure_cors():
             allow_headers=cors_config.get("allow_headers", ["*"]),
         )
 
+# Errors that mean a dependency is down rather than a bug in the request path
+_SERVICE_UNAVAILABLE_ERRORS = (ConfigValidationError, LlamaStackConnectionError, AgentRegistryError)
+
+def _error_envelope(error: str, detail: str, request: Request) -> Dict[str, str]:
+    """Single shape for all error responses"""
+    return {
+        "error": error,
+        "detail": detail,
+        "timestamp": datetime.utcnow().isoformat(),
+        "path": str(request.url)
+    }
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -242,26 +254,12 @@ async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f" Unhandled exception in {request.method} {request.url}: {str(exc)}", exc_info=True)
     
     # Return appropriate error response
-    if isinstance(exc, (ConfigValidationError, LlamaStackConnectionError, AgentRegistryError)):
-        return JSONResponse(
-            status_code=503,
-            content={
-                "error": "Service Unavailable",
-                "detail": str(exc),
-                "timestamp": datetime.utcnow().isoformat(),
-                "path": str(request.url)
-            }
-        )
-    else:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "error": "Internal Server Error",
-                "detail": "An unexpected error occurred",
-                "timestamp": datetime.utcnow().isoformat(),
-                "path": str(request.url)
-            }
-        )
+    if isinstance(exc, _SERVICE_UNAVAILABLE_ERRORS):
+        return JSONResponse(status_code=503, content=_error_envelope("Service Unavailable", str(exc), request))
+    return JSONResponse(
+        status_code=500,
+        content=_error_envelope("Internal Server Error", "An unexpected error occurred", request)
+    )
 
 # Dependency to get agent registry
 def get_agent_registry(request: Request) -> UnifiedAgentRegistry: